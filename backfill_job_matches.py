@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Backfill Job Match Table
+Recompute the stored (coach, job) match scores for every coach
+(run after migrations/add_job_match_table.sql, or to reconcile)
+"""
+
+from core.app_factory import create_app
+from services.match_service import rebuild_job_matches
+
+
+def backfill_job_matches():
+    """Rebuild job_match from the current profiles and active jobs"""
+
+    app = create_app()
+
+    with app.app_context():
+        coaches = rebuild_job_matches()
+        print(f"✅ Rebuilt matches for {coaches} coaches")
+
+
+if __name__ == "__main__":
+    print("🎯 Job Match Backfill")
+    print("=" * 60)
+    backfill_job_matches()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Backfill Job Salary Columns
+One-off fill of job.salary_min / job.salary_max from the free-text salary_range
+(run after migrations/add_job_salary_columns.sql)
+"""
+
+from core.app_factory import create_app
+from core.extensions import db
+from models.job import Job
+from services.job_index_service import parse_salary_range
+
+BATCH_SIZE = 500
+
+
+def backfill_job_salaries():
+    """Parse salary_range for every job in id-ordered batches"""
+
+    app = create_app()
+
+    with app.app_context():
+        last_id = 0
+        updated = 0
+        unparsed = 0
+
+        while True:
+            jobs = Job.query.filter(Job.id > last_id).order_by(Job.id).limit(BATCH_SIZE).all()
+            if not jobs:
+                break
+
+            for job in jobs:
+                salary_min, salary_max = parse_salary_range(job.salary_range)
+                if job.salary_range and salary_min is None:
+                    unparsed += 1
+                if (job.salary_min, job.salary_max) != (salary_min, salary_max):
+                    job.salary_min, job.salary_max = salary_min, salary_max
+                    updated += 1
+
+            db.session.commit()
+            last_id = jobs[-1].id
+            print(f"  processed up to job {last_id}")
+
+        print(f"✅ Updated {updated} jobs ({unparsed} salary texts could not be parsed)")
+
+
+if __name__ == "__main__":
+    print("💰 Job Salary Backfill")
+    print("=" * 60)
+    backfill_job_salaries()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Backfill Daily Rollups
+Recount jobs posted, applications and hires per day into daily_rollup
+(run after migrations/add_daily_rollup_table.sql, or to reconcile)
+
+Usage: python backfill_rollups.py [START_DATE [END_DATE]]   (YYYY-MM-DD)
+"""
+
+import sys
+from datetime import date
+
+from core.app_factory import create_app
+from services.rollup_service import rebuild_rollups
+
+
+def backfill_rollups(start=None, end=None):
+    """Rebuild daily_rollup between start and end (all history by default)"""
+
+    app = create_app()
+
+    with app.app_context():
+        rows = rebuild_rollups(start, end)
+        print(f"✅ Wrote {rows} rollup rows")
+
+
+if __name__ == "__main__":
+    print("📊 Daily Rollup Backfill")
+    print("=" * 60)
+    dates = [date.fromisoformat(arg) for arg in sys.argv[1:3]]
+    backfill_rollups(*dates)
@@ -1,13 +1,101 @@
-from flask import redirect, url_for, request
+"""
+Access Guard
+Compiles each endpoint's access policy once at app start, so the global
+before_request guard is a single dict lookup
+"""
+
+from collections import namedtuple
+
+from flask import abort, current_app, flash, redirect, request, url_for
 from flask_login import current_user
 
 from core.constants import PUBLIC_ENDPOINTS
+from core.onboarding_guard import PROTECTED_ROUTES
+
+# Paths the guard never checks (static files and the JSON API)
+EXEMPT_PATH_PREFIXES = ("/static", "/api")
+
+# Role -> (user flag set once onboarding is done, onboarding endpoint)
+ONBOARDING = {
+    "coach": ("onboarding_completed", "onboarding.onboarding_unified"),
+    "employer": ("employer_onboarding_completed", "onboarding.hirer_onboarding"),
+}
+
+# Blueprints a coach may use before finishing onboarding, even on protected routes
+ONBOARDING_EXEMPT_BLUEPRINTS = {"onboarding", "auth", "public"}
+
+ONBOARDING_NOTICE = "Complete your 3-step onboarding to access this feature and earn 200 coins + Orange Badge!"
+
+
+class AccessPolicy(namedtuple("AccessPolicy", [
+    "public", "onboarding_roles", "onboarding_notice", "membership_feature", "membership_user_type",
+])):
+    """
+    Compiled access rules of one endpoint
+
+    public: logged-in users pass without checks
+    onboarding_roles: roles that must have finished onboarding
+    onboarding_notice: flash ONBOARDING_NOTICE when redirecting to onboarding
+    membership_feature / membership_user_type: from @require_membership on
+        the view (enforced by the decorator; listed for the policy dump)
+    """
+    __slots__ = ()
+
+
+PUBLIC_POLICY = AccessPolicy(True, frozenset(), False, None, None)
+
+
+def compile_access_policies(app):
+    """
+    Build the endpoint -> AccessPolicy table for every registered endpoint
+
+    Call after all blueprints are registered; endpoints added later are
+    compiled on their first request.
+    """
+    rules = {}
+    for rule in app.url_map.iter_rules():
+        rules.setdefault(rule.endpoint, []).append(rule.rule)
+
+    app.extensions["access_policies"] = {
+        endpoint: _compile_policy(endpoint, paths, app.view_functions.get(endpoint))
+        for endpoint, paths in rules.items()
+    }
+    return app.extensions["access_policies"]
+
+
+def get_access_policy(endpoint, app=None):
+    """Compiled policy of an endpoint (None, e.g. for 404s, is public)"""
+    app = app or current_app
+    policies = app.extensions.get("access_policies")
+    if policies is None:
+        policies = compile_access_policies(app)
+
+    policy = policies.get(endpoint)
+    if policy is None:
+        if endpoint is None:
+            return PUBLIC_POLICY
+        paths = [rule.rule for rule in app.url_map.iter_rules(endpoint)] if endpoint in app.view_functions else []
+        policy = policies[endpoint] = _compile_policy(endpoint, paths, app.view_functions.get(endpoint))
+    return policy
+
+
+def dump_access_policies(app):
+    """
+    The compiled table, for debugging
+
+    Returns:
+        list: One dict per endpoint, sorted by endpoint
+    """
+    policies = app.extensions.get("access_policies") or compile_access_policies(app)
+    return [
+        {"endpoint": endpoint, **policy._asdict(), "onboarding_roles": sorted(policy.onboarding_roles)}
+        for endpoint, policy in sorted(policies.items(), key=lambda item: str(item[0]))
+    ]
 
 
 def unified_access_guard():
     """
     Enforces:
-    - Login protection
     - Coach onboarding completion
     - Employer onboarding completion
     - Admin access
@@ -17,45 +105,20 @@ def unified_access_guard():
     if not current_user.is_authenticated:
         return
 
-    # Allow static files and API routes
-    if request.path.startswith("/static") or request.path.startswith("/api"):
+    policy = get_access_policy(request.endpoint)
+    if policy.public:
         return
 
-    endpoint = request.endpoint
-
-    # Public routes always allowed
-    if endpoint in PUBLIC_ENDPOINTS:
+    # Admins can access everything
+    if current_user.role == "admin":
         return
 
-    # -------------------------
-    # Admin users - allow all access
-    # -------------------------
-    if current_user.role == "admin":
-        return  # Admins can access everything
-
-    # -------------------------
-    # Coach enforcement
-    # -------------------------
-    if current_user.role == "coach":
-        # Skip if already on onboarding routes
-        if endpoint and endpoint.startswith('onboarding.'):
-            return
-        
-        if not current_user.onboarding_completed:
-            return redirect(url_for("onboarding.onboarding_unified"))
-
-    # -------------------------
-    # Employer enforcement
-    # -------------------------
-    if current_user.role == "employer":
-        # Skip if already on onboarding routes
-        if endpoint and endpoint.startswith('onboarding.'):
-            return
-        
-        if not current_user.employer_onboarding_completed:
-            return redirect(url_for("onboarding.hirer_onboarding"))
-from flask import abort
-from flask_login import current_user
+    if current_user.role in policy.onboarding_roles:
+        completed_flag, onboarding_endpoint = ONBOARDING[current_user.role]
+        if not getattr(current_user, completed_flag):
+            if policy.onboarding_notice:
+                flash(ONBOARDING_NOTICE, "info")
+            return redirect(url_for(onboarding_endpoint))
 
 
 def require_role(*allowed_roles):
@@ -69,3 +132,34 @@ def require_role(*allowed_roles):
 
     if current_user.role not in allowed_roles:
         abort(403)
+
+
+def _compile_policy(endpoint, paths, view):
+    membership_feature = getattr(view, "membership_feature", None)
+    membership_user_type = getattr(view, "membership_user_type", None)
+    blueprint = endpoint.partition(".")[0] if "." in endpoint else None
+
+    if paths and all(path.startswith(EXEMPT_PATH_PREFIXES) for path in paths):
+        return PUBLIC_POLICY._replace(
+            membership_feature=membership_feature, membership_user_type=membership_user_type
+        )
+
+    if endpoint in PUBLIC_ENDPOINTS:
+        # Public, except protected routes still need a coach's onboarding
+        protected = endpoint in PROTECTED_ROUTES and blueprint not in ONBOARDING_EXEMPT_BLUEPRINTS
+        return AccessPolicy(
+            public=not protected,
+            onboarding_roles=frozenset({"coach"} if protected else ()),
+            onboarding_notice=protected,
+            membership_feature=membership_feature,
+            membership_user_type=membership_user_type,
+        )
+
+    return AccessPolicy(
+        public=False,
+        # Onboarding routes themselves are reachable mid-onboarding
+        onboarding_roles=frozenset() if blueprint == "onboarding" else frozenset(ONBOARDING),
+        onboarding_notice=False,
+        membership_feature=membership_feature,
+        membership_user_type=membership_user_type,
+    )
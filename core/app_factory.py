@@ -4,7 +4,7 @@ from dotenv import load_dotenv
 from flask import Flask
 
 from core.extensions import db, login_manager, mail, socketio
-from core.access_guard import unified_access_guard
+from core.access_guard import compile_access_policies, unified_access_guard
 
 
 # ------------------------------------------------------
@@ -90,18 +90,45 @@ def create_app():
     from core.template_filters import register_template_filters
     register_template_filters(app)
 
+    from core.membership_guard import register_membership_context
+    register_membership_context(app)
+
     # -----------------------------
     # Register Guards
     # -----------------------------
-    from core.onboarding_guard import onboarding_guard
+    # Onboarding and public-route rules are compiled per endpoint once the
+    # blueprints are registered (core/access_guard)
     app.before_request(unified_access_guard)
-    app.before_request(onboarding_guard)
 
     # -----------------------------
     # Register Models (important)
     # -----------------------------
     import models  # noqa
 
+    # Keep platform_counter in step with user/job/application writes
+    from services.counter_service import register_counter_events
+    register_counter_events()
+
+    # Add new jobs, applications, hires and signups to daily_rollup
+    from services.rollup_service import register_rollup_events
+    register_rollup_events()
+
+    # Reload the in-process plan catalog after plan edits commit
+    from services.plan_catalog_service import register_plan_catalog_events
+    register_plan_catalog_events()
+
+    # Reload the cached match-scoring job columns after job writes commit
+    from services.match_service import register_match_events
+    register_match_events()
+
+    # Forget cached dashboard recommendations once rewritten matches commit
+    from services.recommendation_service import register_recommendation_events
+    register_recommendation_events()
+
+    # Feed committed jobs, applications and signups to the live-activity buffer
+    from services.activity_service import register_activity_events
+    register_activity_events()
+
     # -----------------------------
     # Register Blueprints
     # -----------------------------
@@ -133,5 +160,7 @@ def create_app():
     app.register_blueprint(location_bp)
     app.register_blueprint(api_bp)
 
+    compile_access_policies(app)
+
 
     return app
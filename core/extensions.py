@@ -27,5 +27,6 @@ socketio = SocketIO(cors_allowed_origins="*")
 
 @login_manager.user_loader
 def load_user(user_id):
-    from models.user import User
-    return User.query.get(int(user_id))
+    # User, profile and subscription in one query (services/user_loader_service)
+    from services.user_loader_service import load_session_user
+    return load_session_user(user_id)
@@ -4,11 +4,97 @@ Enforces membership requirements for job applications and postings
 """
 
 from functools import wraps
-from flask import session, redirect, url_for, flash, request, current_app
+from flask import session, redirect, url_for, flash, request, current_app, g
 from flask_login import current_user
+from werkzeug.local import LocalProxy
 from models.user import User
-from models.membership import UserSubscription, MembershipPlan
-from datetime import datetime
+from services.plan_catalog_service import get_free_plan, get_plan
+from services.usage_service import UNLIMITED, consume_usage, get_usage
+from services.user_loader_service import get_loaded_subscription
+
+# Limited feature -> plan column holding its monthly limit
+USAGE_LIMIT_FIELDS = {
+    'job_applications': 'monthly_applications',
+    'job_posting': 'monthly_job_posts',
+}
+
+
+class MembershipContext:
+    """
+    A user's subscription, plan and monthly usage, resolved once per request
+
+    Get it with get_membership_context(); guards, views and templates
+    (as `membership`) share the same instance.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        # Eager-loaded with the session user and plans come from the
+        # in-process catalog, so resolving the context costs no queries
+        self.subscription = get_loaded_subscription(user)
+        self._usage = {}
+
+    @property
+    def plan(self):
+        """
+        Catalog plan of the subscription (see services/plan_catalog_service)
+
+        Users without a subscription (not yet provisioned) are on the
+        free plan of their role. Read-only: the free plans are seeded by
+        migrations/seed_free_membership_plans.sql.
+        """
+        if not self.subscription:
+            return get_free_plan(self.user.role)
+        return get_plan(self.subscription.plan_id) or self.subscription.plan
+
+    @property
+    def is_active(self):
+        if not self.subscription:
+            return self.plan is not None
+        # Ended subscriptions are moved to 'expired' by the periodic sweep
+        # (services/subscription_service.sweep_subscriptions)
+        return self.subscription.status == 'active'
+
+    def monthly_usage(self, feature):
+        """Uses of a feature since the start of the month (counted once per request)"""
+        if feature not in self._usage:
+            self._usage[feature] = count_monthly_usage(self.user, feature)
+        return self._usage[feature]
+
+    def forget_usage(self, feature):
+        """Drop a memoized count after recording a use"""
+        self._usage.pop(feature, None)
+
+
+def get_membership_context(user=None):
+    """
+    The membership context for a user (default: the current user) in this request
+
+    Returns:
+        MembershipContext, or None for anonymous users
+    """
+    user = user or current_user
+    if not user or not user.is_authenticated:
+        return None
+
+    contexts = g.setdefault('membership_contexts', {})
+    if user.id not in contexts:
+        contexts[user.id] = MembershipContext(user)
+    return contexts[user.id]
+
+
+def register_membership_context(app):
+    """Expose the current user's membership context to templates as `membership`"""
+
+    @app.context_processor
+    def inject_membership():
+        # Resolved only if a template actually uses it
+        return {'membership': LocalProxy(get_membership_context)}
+
+    @app.teardown_request
+    def clear_membership_context(exc=None):
+        # g belongs to the app context, which can outlive a single request
+        g.pop('membership_contexts', None)
 
 
 def require_membership(required_feature=None, user_type=None):
@@ -34,12 +120,17 @@ def require_membership(required_feature=None, user_type=None):
                 flash(membership_status['message'], 'warning')
                 return redirect(url_for('membership.plans'))
             
-            # Check usage limits if applicable
-            if required_feature and not check_usage_limits(current_user, required_feature):
+            # Early notice on pages leading to a limited use; the use itself
+            # is enforced atomically by consume_usage_limit when recorded
+            if required_feature and request.method == 'GET' and not check_usage_limits(current_user, required_feature):
                 flash('You have reached your monthly limit for this feature. Please upgrade your membership.', 'warning')
                 return redirect(url_for('membership.plans'))
             
             return f(*args, **kwargs)
+        
+        # Read by the access policy table (core/access_guard)
+        decorated_function.membership_feature = required_feature
+        decorated_function.membership_user_type = user_type
         return decorated_function
     return decorator
 
@@ -57,44 +148,41 @@ def check_membership_access(user, required_feature=None, user_type=None):
         dict: {'has_access': bool, 'message': str, 'plan': MembershipPlan}
     """
     try:
-        # Get user's current subscription
-        subscription = UserSubscription.query.filter_by(user_id=user.id).first()
+        # Get user's current subscription (read only; free subscriptions are
+        # created at registration and by provision_free_subscriptions.py)
+        context = get_membership_context(user)
+        plan = context.plan
         
         # If no subscription, user is on free plan
-        if not subscription:
-            # Create default free subscription
-            free_plan = get_or_create_free_plan(user_type or user.role)
-            if free_plan:
-                subscription = create_free_subscription(user.id, free_plan.id)
-            else:
-                return {
-                    'has_access': False,
-                    'message': 'Unable to determine membership status. Please contact support.',
-                    'plan': None
-                }
+        if not plan:
+            return {
+                'has_access': False,
+                'message': 'Unable to determine membership status. Please contact support.',
+                'plan': None
+            }
         
         # Check if subscription is active
-        if not subscription.is_active():
+        if not context.is_active:
             return {
                 'has_access': False,
                 'message': 'Your membership has expired. Please renew to continue using this feature.',
-                'plan': subscription.plan
+                'plan': plan
             }
         
         # Check feature access
         if required_feature:
-            feature_access = check_feature_access(subscription.plan, required_feature)
+            feature_access = check_feature_access(plan, required_feature)
             if not feature_access['has_access']:
                 return {
                     'has_access': False,
                     'message': feature_access['message'],
-                    'plan': subscription.plan
+                    'plan': plan
                 }
         
         return {
             'has_access': True,
             'message': 'Access granted',
-            'plan': subscription.plan
+            'plan': plan
         }
         
     except Exception as e:
@@ -111,7 +199,7 @@ def check_feature_access(plan, feature):
     Check if a membership plan has access to a specific feature
     
     Args:
-        plan: MembershipPlan object
+        plan: CatalogPlan (or MembershipPlan) object
         feature: Feature name to check
     
     Returns:
@@ -172,132 +260,79 @@ def check_usage_limits(user, feature):
         bool: True if within limits, False if exceeded
     """
     try:
-        subscription = UserSubscription.query.filter_by(user_id=user.id).first()
-        if not subscription or not subscription.is_active():
+        context = get_membership_context(user)
+        if not context.is_active:
             return False
         
-        current_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        if feature == 'job_applications':
-            # Check monthly application limit
-            if subscription.plan.monthly_applications == 999999:  # Unlimited
-                return True
-            
-            # Count applications this month
-            from models.application import Application
-            monthly_applications = Application.query.filter(
-                Application.user_id == user.id,
-                Application.applied_date >= current_month
-            ).count()
-            
-            return monthly_applications < subscription.plan.monthly_applications
-        
-        elif feature == 'job_posting':
-            # Check monthly job posting limit
-            if subscription.plan.monthly_job_posts == 999999:  # Unlimited
-                return True
-            
-            # Count job posts this month
-            from models.job import Job
-            monthly_posts = Job.query.filter(
-                Job.employer_id == user.id,
-                Job.posted_date >= current_month
-            ).count()
-            
-            return monthly_posts < subscription.plan.monthly_job_posts
+        limit = usage_limit(context.plan, feature)
+        if limit is None:
+            return True
         
-        return True
+        return context.monthly_usage(feature) < limit
         
     except Exception as e:
         current_app.logger.error(f"Error checking usage limits: {str(e)}")
         return False
 
 
-def get_or_create_free_plan(user_type):
+def usage_limit(plan, feature):
     """
-    Get or create the free membership plan for a user type
+    Monthly limit of a feature on a plan
     
     Args:
-        user_type: 'coach' or 'employer'
+        plan: CatalogPlan (or MembershipPlan) object
+        feature: 'job_applications' or 'job_posting'
     
     Returns:
-        MembershipPlan: Free plan for the user type
+        int: Limit, or None if the feature is not limited on this plan
     """
-    try:
-        # Try to get existing free plan
-        free_plan = MembershipPlan.query.filter_by(
-            name='Free',
-            user_type=user_type,
-            is_active=True
-        ).first()
-        
-        if free_plan:
-            return free_plan
-        
-        # Create free plan if it doesn't exist
-        default_plans = MembershipPlan.get_default_plans()
-        if user_type in default_plans and 'free' in default_plans[user_type]:
-            plan_data = default_plans[user_type]['free']
-            
-            free_plan = MembershipPlan(
-                name=plan_data['name'],
-                user_type=user_type,
-                price=plan_data['price'],
-                duration_days=plan_data['duration_days'],
-                features=plan_data['features'],
-                monthly_applications=plan_data.get('monthly_applications'),
-                monthly_job_posts=plan_data.get('monthly_job_posts'),
-                is_active=True,
-                display_order=0
-            )
-            
-            from core.extensions import db
-            db.session.add(free_plan)
-            db.session.commit()
-            
-            return free_plan
-        
+    field = USAGE_LIMIT_FIELDS.get(feature)
+    if not field:
         return None
-        
-    except Exception as e:
-        current_app.logger.error(f"Error getting/creating free plan: {str(e)}")
+    
+    limit = getattr(plan, field)
+    if limit is None or limit >= UNLIMITED:
         return None
+    return limit
 
 
-def create_free_subscription(user_id, plan_id):
+def consume_usage_limit(user, feature):
     """
-    Create a free subscription for a user
+    Count one use of a limited feature, unless the user's plan limit is reached
+    
+    Call in the same transaction as the insert it counts (before commit);
+    the check and the increment are one atomic UPDATE.
     
     Args:
-        user_id: User ID
-        plan_id: Plan ID
+        user: User object
+        feature: 'job_applications' or 'job_posting'
     
     Returns:
-        UserSubscription: Created subscription
+        bool: True if the use was counted, False if over the limit
     """
-    try:
-        from datetime import date, timedelta
-        from core.extensions import db
-        
-        # Create subscription with very long duration for free plan
-        subscription = UserSubscription(
-            user_id=user_id,
-            plan_id=plan_id,
-            status='active',
-            start_date=date.today(),
-            end_date=date.today() + timedelta(days=999999),  # Effectively unlimited
-            auto_renew=False,
-            payment_method='free'
-        )
-        
-        db.session.add(subscription)
-        db.session.commit()
-        
-        return subscription
-        
-    except Exception as e:
-        current_app.logger.error(f"Error creating free subscription: {str(e)}")
-        return None
+    context = get_membership_context(user)
+    if not context.is_active:
+        return False
+    
+    if not consume_usage(user.id, feature, usage_limit(context.plan, feature)):
+        return False
+    
+    context.forget_usage(feature)
+    return True
+
+
+def count_monthly_usage(user, feature):
+    """
+    Uses of a limited feature by a user this month
+    
+    Args:
+        user: User object
+        feature: 'job_applications' or 'job_posting'
+    
+    Returns:
+        int: Number of applications / job posts this month
+    """
+    return get_usage(user.id, feature)
 
 
 def get_user_membership_info(user):
@@ -311,11 +346,12 @@ def get_user_membership_info(user):
         dict: Membership information
     """
     try:
-        subscription = UserSubscription.query.filter_by(user_id=user.id).first()
+        context = get_membership_context(user)
+        subscription = context.subscription
         
         if not subscription:
             # User has no subscription, return free plan info
-            free_plan = get_or_create_free_plan(user.role)
+            free_plan = context.plan
             return {
                 'has_subscription': False,
                 'plan_name': 'Free',
@@ -328,16 +364,17 @@ def get_user_membership_info(user):
                 'can_upgrade': True
             }
         
+        plan = context.plan
         return {
             'has_subscription': True,
-            'plan_name': subscription.plan.name,
-            'plan_type': subscription.plan.user_type,
+            'plan_name': plan.name,
+            'plan_type': plan.user_type,
             'is_active': subscription.is_active(),
             'days_remaining': subscription.days_remaining(),
-            'features': subscription.plan.features,
-            'monthly_applications': subscription.plan.monthly_applications,
-            'monthly_job_posts': subscription.plan.monthly_job_posts,
-            'can_upgrade': subscription.plan.name != 'Pro' and subscription.plan.name != 'Enterprise',
+            'features': plan.features,
+            'monthly_applications': plan.monthly_applications,
+            'monthly_job_posts': plan.monthly_job_posts,
+            'can_upgrade': plan.name != 'Pro' and plan.name != 'Enterprise',
             'auto_renew': subscription.auto_renew,
             'end_date': subscription.end_date
         }
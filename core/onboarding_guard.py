@@ -4,15 +4,9 @@ Enforces mandatory 3-step onboarding for coaches before accessing profile/jobs
 """
 
 from functools import wraps
-from flask import redirect, url_for, flash, request
+from flask import redirect, url_for, flash
 from flask_login import current_user
 
-def onboarding_guard():
-    # ✅ Skip API routes completely
-    if request.path.startswith("/api/"):
-        return None
-
-
 def require_onboarding_completion(f):
     """
     Decorator to check if coach has completed onboarding
@@ -86,7 +80,8 @@ def get_onboarding_rewards():
     }
 
 
-# Routes that require onboarding completion
+# Routes that require onboarding completion (compiled into the access
+# policies by core/access_guard)
 PROTECTED_ROUTES = [
     'coach.dashboard',
     'coach.coach_jobs',
@@ -109,35 +104,3 @@ def is_protected_route(endpoint):
     """
     return endpoint in PROTECTED_ROUTES
 
-
-def onboarding_guard():
-    """
-    Global before_request function to check onboarding completion
-    """
-    # Skip for non-authenticated users
-    if not current_user.is_authenticated:
-        return
-    
-    # Skip for non-coaches
-    if current_user.role != "coach":
-        return
-    
-    # Skip for onboarding routes themselves
-    if request.endpoint and request.endpoint.startswith('onboarding.'):
-        return
-    
-    # Skip for auth routes
-    if request.endpoint and request.endpoint.startswith('auth.'):
-        return
-    
-    # Skip for public routes
-    if request.endpoint and request.endpoint.startswith('public.'):
-        return
-    
-    # Check if current route is protected
-    if request.endpoint and is_protected_route(request.endpoint):
-        if not current_user.onboarding_completed:
-            flash("Complete your 3-step onboarding to access this feature and earn 200 coins + Orange Badge!", "info")
-            return redirect(url_for("onboarding.onboarding_unified"))
-    
-    return None
\ No newline at end of file
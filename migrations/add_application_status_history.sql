@@ -0,0 +1,20 @@
+-- Migration: Add application_status_history table
+-- Date: 2026-10-17
+-- Description: Append-only log of application status transitions, written
+-- when an employer changes an application's status. Time-to-hire and
+-- time-to-interview are computed from it in SQL. Existing applications have
+-- no history; their past transition times are unknown and are not backfilled.
+
+CREATE TABLE IF NOT EXISTS application_status_history (
+    id SERIAL PRIMARY KEY,
+    application_id INTEGER NOT NULL REFERENCES application(id) ON DELETE CASCADE,
+    from_status VARCHAR(50),
+    status VARCHAR(50) NOT NULL,
+    changed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    changed_by INTEGER REFERENCES "user"(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_application_status_history_status_changed
+    ON application_status_history (status, changed_at);
+CREATE INDEX IF NOT EXISTS idx_application_status_history_application
+    ON application_status_history (application_id, changed_at);
@@ -0,0 +1,13 @@
+-- Migration: Add cache_version table
+-- Date: 2026-10-17
+-- Description: Named version counters shared by all app processes. The
+-- 'job_set' counter is bumped on every job create/edit/toggle and keys the
+-- cached /jobs result fragments.
+
+CREATE TABLE IF NOT EXISTS cache_version (
+    name VARCHAR(50) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO cache_version (name, version) VALUES ('job_set', 0)
+ON CONFLICT (name) DO NOTHING;
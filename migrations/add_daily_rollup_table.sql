@@ -0,0 +1,18 @@
+-- Migration: Add daily_rollup table
+-- Date: 2026-10-17
+-- Description: Per-day counts of jobs posted, applications, hires and signups,
+-- overall (sport/city '*') and per job sport and city. Time-windowed stats sum
+-- these rows instead of scanning job and application. Kept current by ORM
+-- events (services/rollup_service); fill history with backfill_rollups.py.
+
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    id SERIAL PRIMARY KEY,
+    day DATE NOT NULL,
+    metric VARCHAR(50) NOT NULL,
+    sport VARCHAR(100) NOT NULL DEFAULT '*',
+    city VARCHAR(100) NOT NULL DEFAULT '*',
+    value INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT unique_daily_rollup UNIQUE (day, metric, sport, city)
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_rollup_metric_day ON daily_rollup (metric, sport, city, day);
@@ -0,0 +1,36 @@
+-- Migration: Add job_facet_count table
+-- Date: 2026-10-17
+-- Description: Precomputed active-job counts per filter value (sport, job_type,
+-- city, state) for the /jobs filter sidebar. Maintained by employer job
+-- create/edit/toggle; this script creates the table and backfills it.
+
+CREATE TABLE IF NOT EXISTS job_facet_count (
+    id SERIAL PRIMARY KEY,
+    facet VARCHAR(20) NOT NULL,
+    value VARCHAR(150) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT unique_job_facet_value UNIQUE (facet, value)
+);
+
+-- Backfill from current active jobs
+DELETE FROM job_facet_count;
+
+INSERT INTO job_facet_count (facet, value, count)
+SELECT 'sport', sport, COUNT(*) FROM job
+WHERE is_active = TRUE AND sport IS NOT NULL AND sport <> ''
+GROUP BY sport;
+
+INSERT INTO job_facet_count (facet, value, count)
+SELECT 'job_type', job_type, COUNT(*) FROM job
+WHERE is_active = TRUE AND job_type IS NOT NULL AND job_type <> ''
+GROUP BY job_type;
+
+INSERT INTO job_facet_count (facet, value, count)
+SELECT 'city', city, COUNT(*) FROM job
+WHERE is_active = TRUE AND city IS NOT NULL AND city <> ''
+GROUP BY city;
+
+INSERT INTO job_facet_count (facet, value, count)
+SELECT 'state', state, COUNT(*) FROM job
+WHERE is_active = TRUE AND state IS NOT NULL AND state <> ''
+GROUP BY state;
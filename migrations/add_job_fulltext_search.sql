@@ -0,0 +1,25 @@
+-- Migration: Add full-text search over jobs
+-- Date: 2026-10-17
+-- Description: Weighted tsvector over title (A), required_skills (B),
+-- description and requirements (C), kept current by PostgreSQL as a
+-- generated column and indexed with GIN for the /jobs q= keyword search.
+-- Requires PostgreSQL 12+. SQLite development databases use an FTS5
+-- table (job_fts) that the app creates and maintains itself.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'job' AND column_name = 'search_vector'
+    ) THEN
+        ALTER TABLE job ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(required_skills, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'C') ||
+                setweight(to_tsvector('english', coalesce(requirements, '')), 'C')
+            ) STORED;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_job_search_vector ON job USING GIN (search_vector);
@@ -0,0 +1,14 @@
+-- Migration: Add geo grid cell to job table
+-- Date: 2026-10-17
+-- Description: geo_cell buckets (lat, lng) into a fixed 0.2 degree grid so
+-- the "within my range" mode on /jobs can prefilter with an indexed
+-- IN (...) over the few cells covering the search radius before the exact
+-- distance check. Must match services/geo_service.geo_cell_for.
+
+ALTER TABLE job ADD COLUMN IF NOT EXISTS geo_cell INTEGER;
+
+UPDATE job
+SET geo_cell = FLOOR((lat + 90) / 0.2) * 1800 + FLOOR((lng + 180) / 0.2)
+WHERE lat IS NOT NULL AND lng IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_job_active_geo_cell ON job (is_active, geo_cell);
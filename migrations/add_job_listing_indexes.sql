@@ -0,0 +1,14 @@
+-- Migration: Add keyset pagination index for job listing
+-- Date: 2026-10-17
+-- Description: /jobs pages through active jobs ordered by (posted_date DESC, id DESC)
+-- using a cursor instead of loading every row. This composite index lets each
+-- page be served by an index range scan.
+
+-- Rows without posted_date would always sort last; give them their created_at.
+-- NOT NULL keeps the listing's ORDER BY free of NULLS LAST, so it matches the index.
+UPDATE job SET posted_date = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE posted_date IS NULL;
+ALTER TABLE job ALTER COLUMN posted_date SET NOT NULL;
+ALTER TABLE job ALTER COLUMN posted_date SET DEFAULT CURRENT_TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_job_active_posted
+    ON job (is_active, posted_date DESC, id DESC);
@@ -0,0 +1,17 @@
+-- Migration: Add job_match table
+-- Date: 2026-10-17
+-- Description: Materialized (coach, job) match scores for "best matches" and
+-- "best candidates" lookups. Maintained incrementally on job create/edit/toggle
+-- and on coach profile changes; fill it with backfill_job_matches.py.
+
+CREATE TABLE IF NOT EXISTS job_match (
+    id SERIAL PRIMARY KEY,
+    job_id INTEGER NOT NULL REFERENCES job(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    score INTEGER NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT unique_job_match_user_job UNIQUE (user_id, job_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_match_user_score ON job_match (user_id, score, job_id);
+CREATE INDEX IF NOT EXISTS idx_job_match_job_score ON job_match (job_id, score, user_id);
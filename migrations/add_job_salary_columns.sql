@@ -0,0 +1,12 @@
+-- Migration: Add structured salary columns to job table
+-- Date: 2026-10-17
+-- Description: salary_min / salary_max are parsed from the free-text
+-- salary_range when a job is saved, so /jobs can filter and sort by salary
+-- with an index range scan. Existing rows are filled by running
+-- `python backfill_job_salaries.py` after this migration.
+
+ALTER TABLE job ADD COLUMN IF NOT EXISTS salary_min INTEGER;
+ALTER TABLE job ADD COLUMN IF NOT EXISTS salary_max INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_job_active_salary
+    ON job (is_active, salary_max DESC, id DESC);
@@ -0,0 +1,31 @@
+-- Migration: Add platform_counter table
+-- Date: 2026-10-17
+-- Description: Running platform-wide counts read by stats_service instead of
+-- COUNT(*) scans. Kept current by ORM events (services/counter_service) and
+-- corrected by reconcile_counters.py; this script creates and seeds the table.
+
+CREATE TABLE IF NOT EXISTS platform_counter (
+    name VARCHAR(50) PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+INSERT INTO platform_counter (name, value)
+SELECT 'total_coaches', COUNT(*) FROM "user" WHERE role = 'coach'
+UNION ALL
+SELECT 'verified_coaches', COUNT(*) FROM "user" WHERE role = 'coach' AND onboarding_completed = TRUE
+UNION ALL
+SELECT 'total_employers', COUNT(*) FROM "user" WHERE role = 'employer'
+UNION ALL
+SELECT 'active_employers', COUNT(*) FROM "user" WHERE role = 'employer' AND employer_onboarding_completed = TRUE
+UNION ALL
+SELECT 'total_jobs', COUNT(*) FROM job
+UNION ALL
+SELECT 'active_jobs', COUNT(*) FROM job WHERE is_active = TRUE
+UNION ALL
+SELECT 'total_applications', COUNT(*) FROM application
+UNION ALL
+SELECT 'hired_applications', COUNT(*) FROM application WHERE status = 'Hired'
+UNION ALL
+SELECT 'interview_applications', COUNT(*) FROM application WHERE status = 'Interview'
+ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW();
@@ -0,0 +1,8 @@
+-- Migration: Add profile match prefilter indexes
+-- Date: 2026-10-17
+-- Description: Indexes used to narrow coach profiles when matching a job to
+-- candidate coaches (same sport, same city, or inside the search radius).
+
+CREATE INDEX IF NOT EXISTS idx_profile_sport ON profile (sport);
+CREATE INDEX IF NOT EXISTS idx_profile_city ON profile (city);
+CREATE INDEX IF NOT EXISTS idx_profile_lat_lng ON profile (latitude, longitude);
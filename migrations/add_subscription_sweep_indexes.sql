@@ -0,0 +1,10 @@
+-- Migration: Add subscription expiry/renewal indexes
+-- Date: 2026-10-17
+-- Description: Indexes for the periodic subscription sweep
+-- (run_subscription_maintenance.py): active subscriptions by end date, and
+-- pending renewals per user.
+
+CREATE INDEX IF NOT EXISTS idx_user_subscription_status_end
+    ON user_subscription (status, end_date);
+CREATE INDEX IF NOT EXISTS idx_subscription_history_user_action
+    ON subscription_history (user_id, action, status);
@@ -0,0 +1,28 @@
+-- Migration: Add usage_counter table
+-- Date: 2026-10-17
+-- Description: Per-user monthly usage of limited membership features
+-- (job applications, job posts). Incremented with a conditional UPDATE in the
+-- same transaction as the application/job insert, so limits hold under
+-- concurrent submits. Seeds the current month from existing rows.
+
+CREATE TABLE IF NOT EXISTS usage_counter (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    feature VARCHAR(50) NOT NULL,
+    period VARCHAR(7) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT unique_usage_counter_user_feature_period UNIQUE (user_id, feature, period)
+);
+
+INSERT INTO usage_counter (user_id, feature, period, count)
+SELECT user_id, 'job_applications', TO_CHAR(NOW(), 'YYYY-MM'), COUNT(*)
+FROM application
+WHERE applied_date >= DATE_TRUNC('month', NOW())
+GROUP BY user_id
+UNION ALL
+SELECT employer_id, 'job_posting', TO_CHAR(NOW(), 'YYYY-MM'), COUNT(*)
+FROM job
+WHERE posted_date >= DATE_TRUNC('month', NOW())
+GROUP BY employer_id
+ON CONFLICT (user_id, feature, period) DO UPDATE SET count = EXCLUDED.count, updated_at = NOW();
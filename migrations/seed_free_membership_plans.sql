@@ -0,0 +1,31 @@
+-- Migration: Seed the free membership plans
+-- Date: 2026-10-17
+-- Description: Membership guards and registration only read the 'Free'
+-- plan of a role (services/plan_catalog_service.get_free_plan) and never
+-- create it. This script creates the coach and employer free plans if they
+-- are missing; provision_free_subscriptions.py does the same on first run.
+
+INSERT INTO membership_plan (
+    name, user_type, price, duration_days, features,
+    monthly_applications, monthly_job_posts, is_active, display_order
+)
+SELECT plan.name, plan.user_type, 0, 999999, plan.features::json,
+       plan.monthly_applications, plan.monthly_job_posts, TRUE, 0
+FROM (VALUES
+    ('Free', 'coach',
+     '{"browse_jobs": true, "applications_per_month": 3, "featured_profile": false, "direct_messaging": false, "analytics": false, "coaching_tools": false, "revenue_sharing": false, "priority_support": false}',
+     3, NULL::INTEGER),
+    ('Free', 'employer',
+     '{"browse_coaches": true, "post_jobs": true, "job_posts_per_month": 1, "featured_jobs": false, "bulk_messaging": false, "analytics": false, "api_access": false, "dedicated_manager": false}',
+     NULL::INTEGER, 1)
+) AS plan (name, user_type, features, monthly_applications, monthly_job_posts)
+WHERE NOT EXISTS (
+    SELECT 1 FROM membership_plan existing
+    WHERE existing.name = plan.name
+      AND existing.user_type = plan.user_type
+      AND existing.is_active = TRUE
+);
+
+-- The plan catalog is cached per process; make running apps reload it
+INSERT INTO cache_version (name, version) VALUES ('membership_plans', 1)
+ON CONFLICT (name) DO UPDATE SET version = cache_version.version + 1;
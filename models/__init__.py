@@ -1,9 +1,11 @@
 from models.user import User
 from models.profile import Profile
-from models.job import Job
-from models.application import Application
+from models.job import Job, JobFacetCount, JobMatch
+from models.application import Application, ApplicationStatusHistory
 from models.message import Message
 from models.rewards import RewardLedger
 from models.hirer import Hirer, HirerReview
 from models.verification import VerificationStage, VerificationDocument, CoachSlugPage
 from models.language import LanguagePreference, ReferralSystem, EnhancedVerificationStage
+from models.cache import CacheVersion
+from models.stats import PlatformCounter, DailyRollup
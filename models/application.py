@@ -18,3 +18,20 @@ class Application(db.Model):
     screening_answers = db.Column(db.Text)
 
     job = db.relationship("Job", backref="applications")
+
+
+class ApplicationStatusHistory(db.Model):
+    """Append-only log of application status changes; never updated or deleted by the app"""
+    __tablename__ = "application_status_history"
+
+    id = db.Column(db.Integer, primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey("application.id", ondelete="CASCADE"), nullable=False)
+    from_status = db.Column(db.String(50))
+    status = db.Column(db.String(50), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    changed_by = db.Column(db.Integer, db.ForeignKey("user.id"))
+
+    __table_args__ = (
+        db.Index("idx_application_status_history_status_changed", "status", "changed_at"),
+        db.Index("idx_application_status_history_application", "application_id", "changed_at"),
+    )
@@ -0,0 +1,9 @@
+from core.extensions import db
+
+
+class CacheVersion(db.Model):
+    """Named version counter; bumping it invalidates caches keyed on it"""
+    __tablename__ = "cache_version"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
@@ -20,16 +20,63 @@ class Job(db.Model):
     country = db.Column(db.String(100))
     lat = db.Column(db.Float)
     lng = db.Column(db.Float)
+    geo_cell = db.Column(db.Integer)  # Grid bucket of (lat, lng), see services/geo_service
 
     # Hiring
     requirements = db.Column(db.Text)
     screening_questions = db.Column(db.Text)
     required_skills = db.Column(db.String(300))
     salary_range = db.Column(db.String(100))
+    salary_min = db.Column(db.Integer)  # Parsed from salary_range on save
+    salary_max = db.Column(db.Integer)
     job_type = db.Column(db.String(50), default="Full Time")
     working_hours = db.Column(db.String(100))
 
     # Status
     is_active = db.Column(db.Boolean, default=True)
-    posted_date = db.Column(db.DateTime, default=datetime.utcnow)
+    posted_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Add for consistency
+
+    __table_args__ = (
+        db.Index("idx_job_active_posted", "is_active", "posted_date", "id"),
+        db.Index("idx_job_active_salary", "is_active", "salary_max", "id"),
+        db.Index("idx_job_active_geo_cell", "is_active", "geo_cell"),
+    )
+
+
+class JobFacetCount(db.Model):
+    """Precomputed count of active jobs per filter value (sport, job_type, city, state)"""
+    __tablename__ = "job_facet_count"
+
+    id = db.Column(db.Integer, primary_key=True)
+    facet = db.Column(db.String(20), nullable=False)
+    value = db.Column(db.String(150), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint("facet", "value", name="unique_job_facet_value"),
+    )
+
+
+class JobMatch(db.Model):
+    """
+    Materialized match score between a coach and an active job
+
+    Only pairs where the job itself contributes (same sport, same city or
+    within the coach's range) and whose job type the coach accepts are
+    stored. Kept current by services/match_service when jobs or coach
+    profiles change.
+    """
+    __tablename__ = "job_match"
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "job_id", name="unique_job_match_user_job"),
+        db.Index("idx_job_match_user_score", "user_id", "score", "job_id"),
+        db.Index("idx_job_match_job_score", "job_id", "score", "user_id"),
+    )
@@ -183,6 +183,11 @@ class UserSubscription(db.Model):
     # Relationships
     user = db.relationship("User", backref="subscription")
     
+    __table_args__ = (
+        # Expiry/renewal sweeps (services/subscription_service)
+        db.Index("idx_user_subscription_status_end", "status", "end_date"),
+    )
+    
     def __repr__(self):
         return f"<UserSubscription {self.user_id} - {self.plan.name}>"
     
@@ -227,7 +232,7 @@ class SubscriptionHistory(db.Model):
     plan_id = db.Column(db.Integer, db.ForeignKey("membership_plan.id"), nullable=False)
     
     # Action
-    action = db.Column(db.String(50), nullable=False)  # 'purchase', 'renew', 'upgrade', 'downgrade', 'cancel'
+    action = db.Column(db.String(50), nullable=False)  # 'purchase', 'renew', 'upgrade', 'downgrade', 'cancel', 'expire'
     
     # Payment
     amount = db.Column(db.Numeric(10, 2), nullable=False)
@@ -246,12 +251,36 @@ class SubscriptionHistory(db.Model):
     
     # Relationships
     user = db.relationship("User", backref="subscription_history")
+    
+    __table_args__ = (
+        # Pending-renewal lookups by the renewal sweep
+        db.Index("idx_subscription_history_user_action", "user_id", "action", "status"),
+    )
     plan = db.relationship("MembershipPlan")
     
     def __repr__(self):
         return f"<SubscriptionHistory {self.action} for User {self.user_id}>"
 
 
+class UsageCounter(db.Model):
+    """Uses of a limited feature by a user in one month, kept by services/usage_service"""
+    __tablename__ = "usage_counter"
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    feature = db.Column(db.String(50), nullable=False)  # 'job_applications', 'job_posting'
+    period = db.Column(db.String(7), nullable=False)  # 'YYYY-MM'
+    count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "feature", "period", name="unique_usage_counter_user_feature_period"),
+    )
+    
+    def __repr__(self):
+        return f"<UsageCounter {self.feature} for User {self.user_id} in {self.period}: {self.count}>"
+
+
 class OnboardingProgress(db.Model):
     """Track user onboarding progress"""
     __tablename__ = "onboarding_progress"
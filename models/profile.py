@@ -61,3 +61,9 @@ class Profile(db.Model):
     # Stats
     is_verified = db.Column(db.Boolean, default=False)
     views = db.Column(db.Integer, default=0)
+
+    __table_args__ = (
+        db.Index("idx_profile_sport", "sport"),
+        db.Index("idx_profile_city", "city"),
+        db.Index("idx_profile_lat_lng", "latitude", "longitude"),
+    )
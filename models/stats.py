@@ -0,0 +1,33 @@
+from datetime import datetime
+from core.extensions import db
+
+
+class PlatformCounter(db.Model):
+    """Running platform-wide count (coaches, active jobs, hires, ...) kept by services/counter_service"""
+    __tablename__ = "platform_counter"
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class DailyRollup(db.Model):
+    """
+    Count of one event (jobs posted, applications, hires, signups) on one day
+
+    sport/city are '*' on the all-platform row; per-sport/city rows hold the
+    job's sport and city. Kept by services/rollup_service.
+    """
+    __tablename__ = "daily_rollup"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    metric = db.Column(db.String(50), nullable=False)
+    sport = db.Column(db.String(100), nullable=False, default="*")
+    city = db.Column(db.String(100), nullable=False, default="*")
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint("day", "metric", "sport", "city", name="unique_daily_rollup"),
+        db.Index("idx_daily_rollup_metric_day", "metric", "sport", "city", "day"),
+    )
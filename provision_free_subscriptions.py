@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Provision Free Subscriptions
+Bulk-create the free-plan subscription for every coach and employer that
+has none (run once after deploying, then periodically to catch stragglers).
+Creates the free plans first if they are missing.
+"""
+
+from core.app_factory import create_app
+from services.subscription_service import provision_free_subscriptions
+
+
+def run_provisioning():
+    """Create missing free subscriptions in batches"""
+
+    app = create_app()
+
+    with app.app_context():
+        created = provision_free_subscriptions()
+        print(f"✅ Created {created} free subscriptions")
+
+
+if __name__ == "__main__":
+    print("🎟️ Free Subscription Provisioning")
+    print("=" * 60)
+    run_provisioning()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Reconcile Platform Counters
+Recount platform_counter from the user, job and application tables
+(schedule periodically, e.g. hourly from cron)
+"""
+
+from core.app_factory import create_app
+from services.counter_service import reconcile_counters
+
+
+def run_reconciliation():
+    """Recount every counter and report the values"""
+
+    app = create_app()
+
+    with app.app_context():
+        values = reconcile_counters()
+        for name, value in sorted(values.items()):
+            print(f"  {name}: {value}")
+        print(f"✅ Reconciled {len(values)} counters")
+
+
+if __name__ == "__main__":
+    print("🔢 Platform Counter Reconciliation")
+    print("=" * 60)
+    run_reconciliation()
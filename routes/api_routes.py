@@ -3,8 +3,16 @@ API Routes for Real-time Data
 Provides JSON endpoints for live statistics and updates
 """
 
-from flask import Blueprint, jsonify, request
-from services.stats_service import get_platform_stats, get_coach_stats, get_employer_stats, get_live_activity
+from flask import Blueprint, current_app, jsonify, request
+from flask_login import login_required, current_user
+from flask_socketio import emit, join_room
+from core.extensions import socketio
+from services.stats_service import STATS_FALLBACK_TTL_SECONDS, STATS_TTL_SECONDS, get_versioned_stats
+from services.job_search_service import build_job_filters, search_jobs, job_to_dict, job_distances
+from services.geo_service import get_profile_origin
+from services.match_service import get_best_matches, get_best_candidates
+from services.stats_broadcast import stats_room, subscribe, unsubscribe
+from models.job import Job
 from datetime import datetime
 import logging
 
@@ -15,78 +23,157 @@ logger = logging.getLogger(__name__)
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
 
-@api_bp.route("/stats/platform", methods=["GET"])
-def platform_stats():
-    """Get real-time platform statistics"""
+def _cacheable(response, version, fallback=False):
+    """Tag a stats response with its snapshot version and let clients/proxies reuse it"""
+    # Weak: equal versions mean equal data, though the timestamps differ
+    response.set_etag(version, weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATS_FALLBACK_TTL_SECONDS if fallback else STATS_TTL_SECONDS
+    return response
+
+
+def _snapshot_response(name, label):
+    """
+    JSON response for a stats snapshot, or 304 if the client has this version
+
+    The ETag is the snapshot version, so an unchanged poll skips
+    serializing the stats altogether.
+    """
     try:
-        stats = get_platform_stats()
-        return jsonify({
+        stats, version, generated_at = get_versioned_stats(name)
+        fallback = bool(stats.get('fallback'))
+        if request.if_none_match.contains_weak(version):
+            return _cacheable(current_app.response_class(status=304), version, fallback)
+
+        return _cacheable(jsonify({
             "success": True,
             "data": stats,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+            "timestamp": generated_at
+        }), version, fallback)
     except Exception as e:
-        logger.error(f"Error fetching platform stats: {e}")
+        logger.error(f"Error fetching {label}: {e}")
         return jsonify({
             "success": False,
-            "error": "Failed to fetch platform statistics",
+            "error": f"Failed to fetch {label}",
             "timestamp": datetime.utcnow().isoformat()
         }), 500
 
 
+@api_bp.route("/stats/platform", methods=["GET"])
+def platform_stats():
+    """Get real-time platform statistics"""
+    return _snapshot_response('platform', "platform statistics")
+
+
 @api_bp.route("/stats/coach", methods=["GET"])
 def coach_stats():
     """Get real-time coach statistics"""
+    return _snapshot_response('coach', "coach statistics")
+
+
+@api_bp.route("/stats/employer", methods=["GET"])
+def employer_stats():
+    """Get real-time employer statistics"""
+    return _snapshot_response('employer', "employer statistics")
+
+
+@api_bp.route("/stats/live-activity", methods=["GET"])
+def live_activity():
+    """Get recent live activity"""
+    return _snapshot_response('activity', "live activity")
+
+
+@api_bp.route("/jobs", methods=["GET"])
+@login_required
+def jobs_listing():
+    """Get one keyset-paginated page of active jobs (q= keyword search, near=1 range search)"""
     try:
-        stats = get_coach_stats()
+        filters = build_job_filters(request.args)
+        origin = get_profile_origin(current_user.profile)
+        pagination = search_jobs(
+            filters,
+            request.args.get("page_token"),
+            request.args.get("per_page", type=int),
+            origin=origin,
+            profile=current_user.profile
+        )
+        distances = job_distances(pagination.items, origin)
         return jsonify({
             "success": True,
-            "data": stats,
+            "data": {
+                "jobs": [
+                    dict(job_to_dict(job), distance_km=distances.get(job.id))
+                    for job in pagination.items
+                ],
+                "next_page_token": pagination.next_token,
+                "prev_page_token": pagination.prev_token,
+                "filters": filters
+            },
             "timestamp": datetime.utcnow().isoformat()
         })
     except Exception as e:
-        logger.error(f"Error fetching coach stats: {e}")
+        logger.error(f"Error fetching jobs listing: {e}")
         return jsonify({
             "success": False,
-            "error": "Failed to fetch coach statistics",
+            "error": "Failed to fetch jobs",
             "timestamp": datetime.utcnow().isoformat()
         }), 500
 
 
-@api_bp.route("/stats/employer", methods=["GET"])
-def employer_stats():
-    """Get real-time employer statistics"""
+@api_bp.route("/matches/jobs", methods=["GET"])
+@login_required
+def best_matching_jobs():
+    """Get the signed-in coach's best-matching active jobs"""
+    if current_user.role != "coach":
+        return jsonify({"success": False, "error": "Coaches only"}), 403
     try:
-        stats = get_employer_stats()
+        limit = max(1, min(request.args.get("limit", 10, type=int), 50))
+        matches = get_best_matches(current_user.id, limit)
         return jsonify({
             "success": True,
-            "data": stats,
+            "data": [dict(job_to_dict(job), match_score=score) for job, score in matches],
             "timestamp": datetime.utcnow().isoformat()
         })
     except Exception as e:
-        logger.error(f"Error fetching employer stats: {e}")
+        logger.error(f"Error fetching best matching jobs: {e}")
         return jsonify({
             "success": False,
-            "error": "Failed to fetch employer statistics",
+            "error": "Failed to fetch matching jobs",
             "timestamp": datetime.utcnow().isoformat()
         }), 500
 
 
-@api_bp.route("/stats/live-activity", methods=["GET"])
-def live_activity():
-    """Get recent live activity"""
+@api_bp.route("/jobs/<int:job_id>/candidates", methods=["GET"])
+@login_required
+def best_candidates(job_id):
+    """Get the best-matching coaches for one of the signed-in employer's jobs"""
+    job = Job.query.get_or_404(job_id)
+    if job.employer_id != current_user.id:
+        return jsonify({"success": False, "error": "Not your job"}), 403
     try:
-        activity = get_live_activity()
+        limit = max(1, min(request.args.get("limit", 10, type=int), 50))
+        candidates = get_best_candidates(job.id, limit)
         return jsonify({
             "success": True,
-            "data": activity,
+            "data": [
+                {
+                    "user_id": profile.user_id,
+                    "full_name": profile.full_name,
+                    "sport": profile.sport,
+                    "city": profile.city,
+                    "experience_years": profile.experience_years,
+                    "public_slug": profile.public_slug,
+                    "match_score": score
+                }
+                for profile, score in candidates
+            ],
             "timestamp": datetime.utcnow().isoformat()
         })
     except Exception as e:
-        logger.error(f"Error fetching live activity: {e}")
+        logger.error(f"Error fetching candidates for job {job_id}: {e}")
         return jsonify({
             "success": False,
-            "error": "Failed to fetch live activity",
+            "error": "Failed to fetch candidates",
             "timestamp": datetime.utcnow().isoformat()
         }), 500
 
@@ -106,8 +193,12 @@ def health_check():
 def stats_summary():
     """Get a summary of all statistics for dashboard"""
     try:
-        platform = get_platform_stats()
-        activity = get_live_activity()
+        platform, platform_version, platform_generated_at = get_versioned_stats('platform')
+        activity, activity_version, activity_generated_at = get_versioned_stats('activity')
+        version = f"{platform_version}-{activity_version}"
+        fallback = bool(platform.get('fallback') or activity.get('fallback'))
+        if request.if_none_match.contains_weak(version):
+            return _cacheable(current_app.response_class(status=304), version, fallback)
         
         summary = {
             "overview": {
@@ -137,11 +228,11 @@ def stats_summary():
             "last_updated": platform['last_updated']
         }
         
-        return jsonify({
+        return _cacheable(jsonify({
             "success": True,
             "data": summary,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+            "timestamp": max(platform_generated_at, activity_generated_at)
+        }), version, fallback)
         
     except Exception as e:
         logger.error(f"Error fetching stats summary: {e}")
@@ -149,4 +240,24 @@ def stats_summary():
             "success": False,
             "error": "Failed to fetch statistics summary",
             "timestamp": datetime.utcnow().isoformat()
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+# ---------------------------
+# Socket Events
+# ---------------------------
+@socketio.on("subscribe_stats")
+def handle_subscribe_stats(data):
+    """Join a live stats channel ('coach' or 'employer') and send its current snapshot"""
+    channel = (data or {}).get("channel")
+    stats = subscribe(request.sid, channel, current_app._get_current_object())
+    if stats is None:
+        return
+
+    join_room(stats_room(channel))
+    emit("stats_snapshot", {"channel": channel, "stats": stats})
+
+
+@socketio.on("disconnect")
+def handle_stats_disconnect(reason=None):
+    unsubscribe(request.sid)
@@ -17,6 +17,7 @@ from core.extensions import db
 from models.user import User
 from models.profile import Profile
 from services.stats_service import get_coach_stats
+from services.subscription_service import add_free_subscription
 
 # ---------------------------
 # Blueprint
@@ -74,6 +75,7 @@ def register():
             full_name=user.username
         )
         db.session.add(profile)
+        add_free_subscription(user)
         db.session.commit()
 
         login_user(user)
@@ -3,15 +3,21 @@ from flask import (
     request, redirect, url_for, flash, jsonify
 )
 from flask_login import login_required, current_user
+from markupsafe import Markup
 
 from core.extensions import db
 from core.onboarding_guard import require_onboarding_completion
-from core.membership_guard import require_coach_membership, check_usage_limits
+from core.membership_guard import require_coach_membership, consume_usage_limit
 from models.job import Job
 from models.application import Application
 from models.profile import Profile
 from models.user import User
 from services.ai_service import calculate_match_score
+from services.job_search_service import build_job_filters, search_jobs, job_distances
+from services.geo_service import get_profile_origin
+from services.job_index_service import get_job_facets
+from services.recommendation_service import get_recommended_jobs
+from services.cache_service import JOB_SET_VERSION, get_cache_version, cached_fragment
 
 # ---------------------------
 # Blueprint
@@ -30,60 +36,38 @@ def coach_jobs():
     if current_user.role != "coach":
         return redirect(url_for("employer.dashboard"))
     
-    # Get filter parameters
-    sport_filter = request.args.get('sport', 'All')
-    city_filter = request.args.get('city', '')
-    job_type_filter = request.args.get('job_type', 'All')
-    min_salary_filter = request.args.get('min_salary', '')
-    
-    # Build query
-    query = Job.query.filter_by(is_active=True)
-    
-    if sport_filter != 'All':
-        query = query.filter(Job.sport == sport_filter)
-    
-    if city_filter:
-        query = query.filter(Job.location.ilike(f'%{city_filter}%'))
-    
-    if job_type_filter != 'All':
-        query = query.filter(Job.job_type == job_type_filter)
-    
-    jobs = query.all()
-    
-    # Get unique values for filters
-    sports = db.session.query(Job.sport).distinct().all()
-    sports = [s[0] for s in sports if s[0]]
-    
-    job_types = db.session.query(Job.job_type).distinct().all()
-    job_types = [jt[0] for jt in job_types if jt[0]]
-    
-    filters = {
-        'sport': sport_filter,
-        'city': city_filter,
-        'job_type': job_type_filter,
-        'min_salary': min_salary_filter
-    }
-    
-    # Mock pagination object
-    class MockPagination:
-        def __init__(self, items):
-            self.items = items
-            self.pages = 1
-            self.page = 1
-            self.has_prev = False
-            self.has_next = False
-            self.prev_num = None
-            self.next_num = None
+    filters = build_job_filters(request.args)
+    origin = get_profile_origin(current_user.profile)
+    page_token = request.args.get('page_token')
+
+    def render_results():
+        pagination = search_jobs(filters, page_token, origin=origin, profile=current_user.profile)
+        return render_template(
+            "components/job_results.html",
+            jobs=pagination.items,
+            filters=filters,
+            pagination=pagination,
+            distances=job_distances(pagination.items, origin)
+        )
+
+    # The result list only changes when a job is written (job-set version);
+    # best-match ordering is personal, so it is never shared
+    version = get_cache_version(JOB_SET_VERSION)
+    if filters['sort'] == 'match' or version is None:
+        results_html = Markup(render_results())
+    else:
+        key = ('coach_jobs', version, tuple(sorted(filters.items())), page_token, origin)
+        results_html = cached_fragment(key, render_results)
     
-    pagination = MockPagination(jobs)
+    # Filter dropdown values with counts from the facet index
+    facets = get_job_facets()
     
     return render_template(
         "coach_jobs.html",
-        jobs=jobs,
-        sports=sports,
-        job_types=job_types,
+        results_html=results_html,
+        facets=facets,
         filters=filters,
-        pagination=pagination
+        origin=origin
     )
 
 
@@ -111,7 +95,9 @@ def dashboard():
         )
         
     profile = current_user.profile
-    jobs = Job.query.filter_by(is_active=True).limit(5).all()  # Show recent jobs
+    recommended = get_recommended_jobs(profile, k=5) if profile else []
+    jobs = [job for job, _ in recommended]
+    match_scores = {job.id: score for job, score in recommended}
     my_apps = Application.query.filter_by(user_id=current_user.id).all()
 
     # Calculate profile completion percentage
@@ -142,6 +128,7 @@ def dashboard():
     return render_template(
         "coach_listing.html",
         jobs=jobs,
+        match_scores=match_scores,
         my_apps=my_apps,
         profile=profile,
         profile_completion=profile_completion,
@@ -343,11 +330,6 @@ def apply_job(job_id):
     if current_user.role != "coach":
         return redirect(url_for("employer.dashboard"))
 
-    # Check usage limits before allowing application
-    if not check_usage_limits(current_user, 'job_applications'):
-        flash('You have reached your monthly application limit. Please upgrade your membership to apply for more jobs.', 'warning')
-        return redirect(url_for('membership.plans'))
-
     job = Job.query.get_or_404(job_id)
     
     # Check if already applied
@@ -373,6 +355,13 @@ def apply_job(job_id):
         match_reasons=reason
     )
 
+    # Count the application against the monthly limit; atomic, so
+    # concurrent submits cannot both take the last slot
+    if not consume_usage_limit(current_user, 'job_applications'):
+        db.session.rollback()
+        flash('You have reached your monthly application limit. Please upgrade your membership to apply for more jobs.', 'warning')
+        return redirect(url_for('membership.plans'))
+
     db.session.add(application)
     db.session.commit()
 
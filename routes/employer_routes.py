@@ -3,12 +3,18 @@ from flask_login import login_required, current_user, login_user
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from core.extensions import db
-from core.membership_guard import require_employer_membership, check_usage_limits
+from core.membership_guard import require_employer_membership, consume_usage_limit
 from models.job import Job
 from models.user import User
 from models.application import Application # Added import
+from models.verification import CoachSlugPage
 from services.ai_service import predict_salary
 from services.stats_service import get_employer_stats
+from services.application_status_service import set_application_status
+from services.subscription_service import add_free_subscription
+from services.job_index_service import snapshot_job, reindex_job
+from services.match_service import queue_job_matching, get_best_candidates
+from services.geo_service import haversine_km
 
 # ---------------------------
 # Blueprint
@@ -63,6 +69,8 @@ def register():
             role="employer"
         )
         db.session.add(user)
+        db.session.flush()
+        add_free_subscription(user)
         db.session.commit()
 
         login_user(user)
@@ -81,11 +89,6 @@ def new_job():
     if current_user.role != "employer":
         return redirect(url_for("employer.dashboard"))
 
-    # Check usage limits before allowing job posting
-    if not check_usage_limits(current_user, 'job_posting'):
-        flash('You have reached your monthly job posting limit. Please upgrade your membership to post more jobs.', 'warning')
-        return redirect(url_for('membership.plans'))
-
     predicted_salary = None
     ai_reason = None
     form_data = {}
@@ -185,11 +188,22 @@ def new_job():
             job_type=job_type,
             working_hours=working_hours or None,
             salary_range=salary or None,
+            lat=request.form.get("lat", type=float),
+            lng=request.form.get("lng", type=float),
             is_active=True
         )
 
+        # Count the post against the monthly limit; atomic, so
+        # concurrent submits cannot both take the last slot
+        if not consume_usage_limit(current_user, 'job_posting'):
+            db.session.rollback()
+            flash('You have reached your monthly job posting limit. Please upgrade your membership to post more jobs.', 'warning')
+            return redirect(url_for('membership.plans'))
+
         db.session.add(job)
+        reindex_job(job)
         db.session.commit()
+        queue_job_matching(job.id)
         flash("Job posted successfully", "success")
 
         return redirect(url_for("employer.dashboard"))
@@ -215,12 +229,19 @@ def edit_job(job_id):
         return redirect(url_for("employer.dashboard"))
     
     if request.method == "POST":
+        before = snapshot_job(job)
         job.title = request.form.get("title")
         job.sport = request.form.get("sport")
         job.description = request.form.get("description")
-        job.city = request.form.get("city")
+        job.requirements = request.form.get("requirements", job.requirements)
+        job.salary_range = request.form.get("salary", job.salary_range) or None
+        job.lat = request.form.get("lat", job.lat, type=float)
+        job.lng = request.form.get("lng", job.lng, type=float)
+        job.city = request.form.get("city", job.city)
         
+        reindex_job(job, before)
         db.session.commit()
+        queue_job_matching(job.id)
         flash("Job updated successfully", "success")
         return redirect(url_for("employer.dashboard"))
     
@@ -240,8 +261,11 @@ def toggle_job_status(job_id):
         flash("You can only manage your own jobs", "error")
         return redirect(url_for("employer.dashboard"))
     
+    before = snapshot_job(job)
     job.is_active = not job.is_active
+    reindex_job(job, before)
     db.session.commit()
+    queue_job_matching(job.id)
     
     status = "activated" if job.is_active else "deactivated"
     flash(f"Job {status} successfully", "success")
@@ -261,7 +285,7 @@ def update_status(app_id, new_status):
         flash("You can only manage applications for your jobs", "error")
         return redirect(url_for("employer.dashboard"))
     
-    app.status = new_status
+    set_application_status(app, new_status, changed_by=current_user.id)
     
     # Handle interview scheduling
     if new_status == "Interview" and request.method == "POST":
@@ -329,7 +353,8 @@ def jobs():
 @employer_bp.route("/explore")
 @login_required
 def explore_coaches():
-    # Mock data for template rendering
+    """Best-matching coaches for one of the employer's active jobs"""
+    # Candidates are a single ranked page
     class Pagination:
         page = 1
         pages = 1
@@ -338,10 +363,61 @@ def explore_coaches():
         prev_num = None
         next_num = None
 
+    filters = {
+        'job_id': request.args.get('job_id', type=int),
+        'sport': request.args.get('sport', ''),
+        'verified': request.args.get('verified', ''),
+        'min_exp': request.args.get('min_exp', type=int),
+    }
+
+    jobs = []
+    job = None
+    if current_user.role == "employer":
+        jobs = Job.query.filter_by(employer_id=current_user.id, is_active=True).order_by(Job.posted_date.desc()).all()
+        job = next((j for j in jobs if j.id == filters['job_id']), jobs[0] if jobs else None)
+
+    # Reverse matches are stored in the background when the job is saved
+    candidates = get_best_candidates(job.id, 50) if job else []
+
+    coaches = []
+    match_scores = {}
+    distances = {}
+    for profile, score in candidates:
+        if filters['sport'] and profile.sport != filters['sport']:
+            continue
+        if filters['verified'] == '1' and not profile.is_verified:
+            continue
+        if filters['min_exp'] and _experience_years(profile) < filters['min_exp']:
+            continue
+        coaches.append(profile)
+        match_scores[profile.user_id] = score
+        if job.lat is not None and job.lng is not None and profile.latitude is not None and profile.longitude is not None:
+            distances[profile.user_id] = round(haversine_km(job.lat, job.lng, profile.latitude, profile.longitude), 1)
+
+    # Public profile pages, for coaches that have an active one
+    profile_slugs = {}
+    if coaches:
+        profile_slugs = dict(db.session.query(CoachSlugPage.user_id, CoachSlugPage.slug).filter(
+            CoachSlugPage.user_id.in_([profile.user_id for profile in coaches]),
+            CoachSlugPage.is_active == True
+        ))
+
     return render_template(
         "coach_explore.html",
-        coaches=[],
-        sports=[],
-        filters={},
-        pagination=Pagination()
+        coaches=coaches,
+        sports=sorted({profile.sport for profile, _ in candidates if profile.sport}),
+        filters=filters,
+        pagination=Pagination(),
+        jobs=jobs,
+        job=job,
+        match_scores=match_scores,
+        distances=distances,
+        profile_slugs=profile_slugs
     )
+
+
+def _experience_years(profile):
+    try:
+        return int(profile.experience_years or 0)
+    except (ValueError, TypeError):
+        return 0
@@ -3,13 +3,14 @@ Membership Routes
 Handles membership plans, subscriptions, and billing
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, abort
 from flask_login import login_required, current_user
 from models.user import User
 from models.membership import MembershipPlan, UserSubscription, SubscriptionHistory
-from core.membership_guard import get_user_membership_info, check_membership_access
+from core.membership_guard import get_user_membership_info, check_membership_access, get_membership_context
 from core.extensions import db
-from datetime import datetime, date, timedelta
+from services.plan_catalog_service import get_active_plans, get_plan, invalidate_plan_catalog
+from datetime import datetime, timedelta
 import json
 
 membership_bp = Blueprint('membership', __name__, url_prefix='/membership')
@@ -27,29 +28,15 @@ def plans():
             user = current_user
             current_membership = get_user_membership_info(user)
         
-        # Get all active plans
-        coach_plans = MembershipPlan.query.filter_by(
-            user_type='coach',
-            is_active=True
-        ).order_by(MembershipPlan.display_order).all()
-        
-        employer_plans = MembershipPlan.query.filter_by(
-            user_type='employer',
-            is_active=True
-        ).order_by(MembershipPlan.display_order).all()
+        # Get all active plans (from the in-process plan catalog)
+        coach_plans = get_active_plans('coach')
+        employer_plans = get_active_plans('employer')
         
         # If no plans exist, create default ones
         if not coach_plans or not employer_plans:
             create_default_plans()
-            coach_plans = MembershipPlan.query.filter_by(
-                user_type='coach',
-                is_active=True
-            ).order_by(MembershipPlan.display_order).all()
-            
-            employer_plans = MembershipPlan.query.filter_by(
-                user_type='employer',
-                is_active=True
-            ).order_by(MembershipPlan.display_order).all()
+            coach_plans = get_active_plans('coach')
+            employer_plans = get_active_plans('employer')
         
         return render_template('membership_plans.html',
                              coach_plans=coach_plans,
@@ -69,7 +56,7 @@ def subscribe(plan_id):
     """Subscribe to a membership plan"""
     try:
         user = current_user
-        plan = MembershipPlan.query.get_or_404(plan_id)
+        plan = get_plan(plan_id) or abort(404)
         
         # Check if plan matches user type
         if plan.user_type != user.role:
@@ -107,7 +94,7 @@ def payment(plan_id):
     """Payment page for membership subscription"""
     try:
         user = current_user
-        plan = MembershipPlan.query.get_or_404(plan_id)
+        plan = get_plan(plan_id) or abort(404)
         
         # Check if plan matches user type
         if plan.user_type != user.role:
@@ -139,7 +126,7 @@ def process_payment():
     try:
         data = request.get_json()
         user = current_user
-        plan = MembershipPlan.query.get(data.get('plan_id'))
+        plan = get_plan(data.get('plan_id'))
         
         if not plan:
             return jsonify({'success': False, 'message': 'Invalid plan selected.'})
@@ -249,28 +236,29 @@ def upgrade(plan_id):
     """Upgrade to a higher plan"""
     try:
         user = current_user
-        new_plan = MembershipPlan.query.get_or_404(plan_id)
+        new_plan = get_plan(plan_id) or abort(404)
         current_subscription = UserSubscription.query.filter_by(user_id=user.id).first()
+        current_plan = get_plan(current_subscription.plan_id) if current_subscription else None
         
         # Check if upgrade is valid
         if not current_subscription:
             flash('No current subscription found.', 'error')
             return redirect(url_for('membership.plans'))
         
-        if new_plan.price <= current_subscription.plan.price:
+        if new_plan.price <= current_plan.price:
             flash('You can only upgrade to a higher plan.', 'error')
             return redirect(url_for('membership.plans'))
         
         # Calculate prorated amount
         days_remaining = current_subscription.days_remaining()
-        daily_rate_old = float(current_subscription.plan.price) / current_subscription.plan.duration_days
+        daily_rate_old = float(current_plan.price) / current_plan.duration_days
         daily_rate_new = float(new_plan.price) / new_plan.duration_days
         
         credit_amount = days_remaining * daily_rate_old
         upgrade_amount = float(new_plan.price) - credit_amount
         
         return render_template('membership_upgrade.html',
-                             current_plan=current_subscription.plan,
+                             current_plan=current_plan,
                              new_plan=new_plan,
                              days_remaining=days_remaining,
                              credit_amount=credit_amount,
@@ -296,10 +284,13 @@ def create_subscription(user_id, plan_id, payment_method, payment_id=None):
         bool: Success status
     """
     try:
-        plan = MembershipPlan.query.get(plan_id)
+        plan = get_plan(plan_id)
         if not plan:
             return False
         
+        # UTC, like the expiry checks in the model and the sweep
+        today = datetime.utcnow().date()
+
         # Check for existing subscription
         existing_subscription = UserSubscription.query.filter_by(user_id=user_id).first()
         
@@ -307,8 +298,8 @@ def create_subscription(user_id, plan_id, payment_method, payment_id=None):
             # Update existing subscription
             existing_subscription.plan_id = plan_id
             existing_subscription.status = 'active'
-            existing_subscription.start_date = date.today()
-            existing_subscription.end_date = date.today() + timedelta(days=plan.duration_days)
+            existing_subscription.start_date = today
+            existing_subscription.end_date = today + timedelta(days=plan.duration_days)
             existing_subscription.payment_method = payment_method
             existing_subscription.payment_id = payment_id
             existing_subscription.auto_renew = True
@@ -318,8 +309,8 @@ def create_subscription(user_id, plan_id, payment_method, payment_id=None):
                 user_id=user_id,
                 plan_id=plan_id,
                 status='active',
-                start_date=date.today(),
-                end_date=date.today() + timedelta(days=plan.duration_days),
+                start_date=today,
+                end_date=today + timedelta(days=plan.duration_days),
                 payment_method=payment_method,
                 payment_id=payment_id,
                 auto_renew=True
@@ -360,6 +351,7 @@ def create_default_plans():
                     )
                     db.session.add(plan)
         
+        invalidate_plan_catalog()
         db.session.commit()
         current_app.logger.info("Default membership plans created successfully")
         
@@ -379,8 +371,6 @@ def get_usage_statistics(user):
         dict: Usage statistics
     """
     try:
-        current_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
         stats = {
             'monthly_applications': 0,
             'monthly_job_posts': 0,
@@ -389,22 +379,16 @@ def get_usage_statistics(user):
         }
         
         if user.role == 'coach':
-            # Count applications
+            # Count applications (monthly count shared with the membership guard)
             from models.application import Application
-            stats['monthly_applications'] = Application.query.filter(
-                Application.user_id == user.id,
-                Application.applied_date >= current_month
-            ).count()
+            stats['monthly_applications'] = get_membership_context(user).monthly_usage('job_applications')
             
             stats['total_applications'] = Application.query.filter_by(user_id=user.id).count()
         
         elif user.role == 'employer':
-            # Count job posts
+            # Count job posts (monthly count shared with the membership guard)
             from models.job import Job
-            stats['monthly_job_posts'] = Job.query.filter(
-                Job.employer_id == user.id,
-                Job.posted_date >= current_month
-            ).count()
+            stats['monthly_job_posts'] = get_membership_context(user).monthly_usage('job_posting')
             
             stats['total_job_posts'] = Job.query.filter_by(employer_id=user.id).count()
         
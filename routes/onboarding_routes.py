@@ -31,6 +31,7 @@ from models.user import User
 from services.otp_service import send_mobile_otp, send_email_otp_service, verify_otp
 from services.email_service import send_welcome_email
 from services.reward_service import award_reward
+from services.match_service import snapshot_profile, refresh_coach_matches
 
 # ---------------------------
 # Blueprint
@@ -242,6 +243,7 @@ def handle_stage1_submission(profile):
     language_proficiency = request.form.getlist("language_proficiency")
     
     # Update profile
+    before = snapshot_profile(profile)
     full_name = f"{first_name} {last_name}"
     profile.full_name = full_name
     profile.phone = phone
@@ -291,6 +293,7 @@ def handle_stage1_submission(profile):
     
     # Move to next step
     current_user.onboarding_step = 2
+    refresh_coach_matches(profile, before)
     db.session.commit()
     
     return redirect(url_for("onboarding.onboarding_unified"))
@@ -313,6 +316,7 @@ def handle_stage2_submission(profile):
         return redirect(url_for("onboarding.onboarding_unified"))
     
     # Update profile
+    before = snapshot_profile(profile)
     profile.state = state
     profile.city = city
     profile.location = location
@@ -325,6 +329,8 @@ def handle_stage2_submission(profile):
     elif not store_range:
         profile.range_km = None  # Clear range for session-based jobs
     
+    refresh_coach_matches(profile, before)
+    
     # Award Purple Badge
     assign_badge(current_user, "Purple Badge")
     award_coins(current_user, 200, "Purple Badge earned for location setup!")
@@ -356,12 +362,14 @@ def handle_stage3_submission(profile):
         return redirect(url_for("onboarding.onboarding_unified"))
     
     # Update profile
+    before = snapshot_profile(profile)
     profile.education = education
     profile.specialization = specialization
     profile.has_professional_cert = has_professional_cert
     profile.cert_name = cert_name
     profile.playing_level = playing_level
     profile.experience_years = experience
+    refresh_coach_matches(profile, before)
     
     # Handle document uploads
     if education_doc and is_allowed_file(education_doc.filename):
@@ -12,6 +12,7 @@ from models.verification import VerificationStage, VerificationDocument, CoachSl
 from models.user import User
 from models.profile import Profile
 from services.verification_service import VerificationService
+from services.match_service import snapshot_profile, refresh_coach_matches
 from services.otp_service import generate_otp, save_otp, verify_otp
 from services.email_service import send_otp_email
 from validators.phone_validator import is_valid_phone
@@ -227,6 +228,7 @@ def set_location():
     longitude = request.form.get("longitude")
     job_type = request.form.get("job_type")
     range_km = request.form.get("range_km")
+    before = snapshot_profile(current_user.profile)
     
     # Update verification stage
     if language:
@@ -257,6 +259,7 @@ def set_location():
     stage.serviceable_area_set = True
     stage.specific_location_set = True
     
+    refresh_coach_matches(current_user.profile, before)
     db.session.commit()
     
     # Check if stage 2 is complete
@@ -296,6 +299,7 @@ def add_education():
     
     qualification = request.form.get("qualification")
     specialization = request.form.get("specialization")
+    before = snapshot_profile(current_user.profile)
     
     if qualification:
         stage.education_qualification_added = True
@@ -305,6 +309,7 @@ def add_education():
     if specialization:
         stage.specialization_added = True
     
+    refresh_coach_matches(current_user.profile, before)
     db.session.commit()
     flash("Education details added", "success")
     
@@ -318,12 +323,14 @@ def add_experience():
     
     experience_years = request.form.get("experience_years")
     experience_details = request.form.get("experience_details")
+    before = snapshot_profile(current_user.profile)
     
     if experience_years:
         stage.experience_added = True
         current_user.profile.experience_years = int(experience_years)
         current_user.profile.bio = experience_details
     
+    refresh_coach_matches(current_user.profile, before)
     db.session.commit()
     flash("Experience details added", "success")
     
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Subscription Maintenance
+Expire ended subscriptions, renew free auto-renewing ones and queue paid
+renewals (schedule periodically, e.g. hourly from cron)
+"""
+
+from core.app_factory import create_app
+from services.subscription_service import sweep_subscriptions
+
+
+def run_maintenance():
+    """Run one expiry/renewal sweep and report what changed"""
+
+    app = create_app()
+
+    with app.app_context():
+        results = sweep_subscriptions()
+        print(f"  Renewed (free): {results['renewed']}")
+        print(f"  Renewals queued: {results['queued']}")
+        print(f"  Expired: {results['expired']}")
+        print("✅ Subscription sweep complete")
+
+
+if __name__ == "__main__":
+    print("🔁 Subscription Maintenance")
+    print("=" * 60)
+    run_maintenance()
@@ -0,0 +1,205 @@
+"""
+Activity Service
+In-memory feed of recent job postings and rolling per-minute counts of jobs,
+applications and signups behind the live-activity stats, so reading them
+runs no queries
+"""
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from models.application import Application
+from models.job import Job
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Most recent job postings kept per process for the feed
+ACTIVITY_BUFFER_SIZE = 500
+
+# Events older than this are left out of the feed and the counts
+ACTIVITY_WINDOW = timedelta(days=1)
+
+# Counts are kept per minute, so a rolling window is a bounded sum
+ACTIVITY_BUCKET_SECONDS = 60
+
+JOB_POSTED = 'job_posted'
+APPLICATION_CREATED = 'application_created'
+USER_REGISTERED = 'user_registered'
+
+ACTIVITY_TYPES = (JOB_POSTED, APPLICATION_CREATED, USER_REGISTERED)
+
+# Latest job postings, oldest first; dicts with 'type', 'at', 'title', 'sport', 'location'
+_recent_jobs = deque(maxlen=ACTIVITY_BUFFER_SIZE)
+# Event type -> [bucket start, count] per minute, oldest first; at most one
+# window of buckets, however many events happen, so counts are never capped
+_event_counts = {kind: deque() for kind in ACTIVITY_TYPES}
+_activity_lock = threading.Lock()
+_activity_loaded = False
+
+_events_registered = False
+
+
+def register_activity_events():
+    """Attach the listeners that add committed inserts to the feed and counts"""
+    global _events_registered
+    if _events_registered:
+        return
+
+    event.listen(Job, 'after_insert', _job_inserted)
+    event.listen(Application, 'after_insert', _application_inserted)
+    event.listen(User, 'after_insert', _user_inserted)
+
+    # Inserts are held on the session until it commits, so rolled-back
+    # rows never reach the feed
+    event.listen(Session, 'after_commit', _publish_pending)
+    event.listen(Session, 'after_rollback', _discard_pending)
+
+    _events_registered = True
+
+
+def get_recent_jobs(since=None):
+    """
+    Job postings newer than `since` (default: the last ACTIVITY_WINDOW), newest first
+
+    Loads the feed from the database on first use in this process.
+    """
+    _ensure_loaded()
+    since = since or datetime.utcnow() - ACTIVITY_WINDOW
+    with _activity_lock:
+        return [item for item in reversed(_recent_jobs) if item['at'] >= since]
+
+
+def count_recent_activity(kind, since=None):
+    """
+    Number of events of a type since `since` (default: the last ACTIVITY_WINDOW)
+
+    Accurate to the minute; loads the counts on first use in this process.
+    """
+    _ensure_loaded()
+    since = _bucket(since or datetime.utcnow() - ACTIVITY_WINDOW)
+    with _activity_lock:
+        return sum(count for bucket, count in _event_counts[kind] if bucket >= since)
+
+
+def record_activity(kind, at=None, **details):
+    """Add an event to the feed and the counts"""
+    with _activity_lock:
+        _append(kind, at, details)
+
+
+def load_recent_activity():
+    """
+    Rebuild the feed and counts from the last ACTIVITY_WINDOW of jobs and applications
+
+    Users have no creation time, so signups are only counted as they happen.
+    """
+    global _activity_loaded
+    since = datetime.utcnow() - ACTIVITY_WINDOW
+
+    jobs = Job.query.filter(Job.created_at >= since).order_by(
+        Job.created_at.desc()
+    ).limit(ACTIVITY_BUFFER_SIZE).all()
+    # Creation times only, to count every job and application in the window
+    job_times = Job.query.with_entities(Job.created_at).filter(Job.created_at >= since).all()
+    application_times = Application.query.with_entities(Application.created_at).filter(
+        Application.created_at >= since
+    ).all()
+
+    with _activity_lock:
+        # Signups counted so far are kept; they cannot be reloaded
+        _recent_jobs.clear()
+        _recent_jobs.extend(
+            {'type': JOB_POSTED, 'at': job.created_at, **_job_details(job)} for job in reversed(jobs)
+        )
+        for kind, times in ((JOB_POSTED, job_times), (APPLICATION_CREATED, application_times)):
+            _event_counts[kind].clear()
+            for at, in sorted(times):
+                _count(kind, at)
+        _activity_loaded = True
+
+
+def _ensure_loaded():
+    if _activity_loaded:
+        return
+    try:
+        load_recent_activity()
+    except Exception as e:
+        logger.error(f"Error loading recent activity: {e}")
+
+
+def _append(kind, at, details):
+    at = at or datetime.utcnow()
+    if kind == JOB_POSTED:
+        _recent_jobs.append({'type': kind, 'at': at, **details})
+    _count(kind, at)
+
+
+def _bucket(at):
+    return at - timedelta(seconds=at.second % ACTIVITY_BUCKET_SECONDS, microseconds=at.microsecond)
+
+
+def _count(kind, at):
+    buckets = _event_counts[kind]
+    bucket = _bucket(at)
+
+    # Events arrive (nearly) in order, so the bucket is almost always the last
+    if not buckets or buckets[-1][0] < bucket:
+        buckets.append([bucket, 1])
+    elif buckets[-1][0] == bucket:
+        buckets[-1][1] += 1
+    else:
+        counts = {entry[0]: entry[1] for entry in buckets}
+        counts[bucket] = counts.get(bucket, 0) + 1
+        buckets.clear()
+        buckets.extend([start, count] for start, count in sorted(counts.items()))
+
+    # Drop buckets that have left the window
+    oldest = _bucket(datetime.utcnow() - ACTIVITY_WINDOW)
+    while buckets and buckets[0][0] < oldest:
+        buckets.popleft()
+
+
+def _job_details(job):
+    return {
+        'title': job.title,
+        'sport': job.sport,
+        'location': job.city or job.location,
+    }
+
+
+def _queue(target, kind, at, details):
+    session = object_session(target)
+    if session is None:
+        record_activity(kind, at, **details)
+    else:
+        session.info.setdefault('pending_activity', []).append((kind, at, details))
+
+
+def _publish_pending(session):
+    pending = session.info.pop('pending_activity', None)
+    if pending:
+        with _activity_lock:
+            for kind, at, details in pending:
+                _append(kind, at, details)
+
+
+def _discard_pending(session):
+    session.info.pop('pending_activity', None)
+
+
+def _job_inserted(mapper, connection, target):
+    _queue(target, JOB_POSTED, target.created_at, _job_details(target))
+
+
+def _application_inserted(mapper, connection, target):
+    _queue(target, APPLICATION_CREATED, target.created_at, {})
+
+
+def _user_inserted(mapper, connection, target):
+    _queue(target, USER_REGISTERED, None, {'role': target.role})
@@ -2,36 +2,60 @@ import os
 import requests
 import json
 from flask import current_app
+from services.geo_service import get_profile_origin, haversine_km
+
+# Match score weights (shared with services/match_service batch scoring)
+SPORT_MATCH_POINTS = 40
+LOCATION_MATCH_POINTS = 20
+EXPERIENCE_POINTS = 20
+CERTIFICATION_POINTS = 20
+
 
 def calculate_match_score(profile, job):
     score = 0
     reasons = []
 
     if profile.sport == job.sport:
-        score += 40
+        score += SPORT_MATCH_POINTS
         reasons.append("Matching sport")
 
-    if profile.city == job.city:
-        score += 20
+    if profile.city and profile.city == job.city:
+        score += LOCATION_MATCH_POINTS
         reasons.append("Same city")
+    elif is_within_range(profile, job):
+        score += LOCATION_MATCH_POINTS
+        reasons.append("Within your range")
 
-    if profile.experience_years:
-        try:
-            exp_years = int(profile.experience_years)
-            if exp_years >= 2:
-                score += 20
-                reasons.append("Sufficient experience")
-        except (ValueError, TypeError):
-            # Handle case where experience_years is not a valid number
-            pass
+    if has_sufficient_experience(profile):
+        score += EXPERIENCE_POINTS
+        reasons.append("Sufficient experience")
 
     if profile.certifications:
-        score += 20
+        score += CERTIFICATION_POINTS
         reasons.append("Has certifications")
 
     return score, ", ".join(reasons)
 
 
+def has_sufficient_experience(profile):
+    """Check if the coach has at least 2 years of experience"""
+    if not profile.experience_years:
+        return False
+    try:
+        return int(profile.experience_years) >= 2
+    except (ValueError, TypeError):
+        # Handle case where experience_years is not a valid number
+        return False
+
+
+def is_within_range(profile, job):
+    """Check if a geocoded job lies inside the coach's service radius"""
+    origin = get_profile_origin(profile)
+    if not origin or job.lat is None or job.lng is None:
+        return False
+    return haversine_km(origin[0], origin[1], job.lat, job.lng) <= origin[2]
+
+
 def predict_salary(title, sport, city, state, country, job_type, requirements=None):
     """
     Use AI to predict salary range for a coaching position
@@ -0,0 +1,44 @@
+"""
+Application Status Service
+Status changes for applications, recorded in the append-only status history
+"""
+
+from datetime import datetime
+
+from core.extensions import db
+from models.application import ApplicationStatusHistory
+
+
+def set_application_status(application, status, changed_by=None):
+    """
+    Change an application's status and log the transition
+
+    Runs inside the caller's transaction; the caller commits.
+
+    Args:
+        application: Application to update
+        status: New status (Applied, Interview, Hired, ...)
+        changed_by: Id of the user making the change
+
+    Returns:
+        bool: False if the application already had this status (nothing logged)
+    """
+    if application.status == status:
+        return False
+
+    db.session.add(ApplicationStatusHistory(
+        application_id=application.id,
+        from_status=application.status,
+        status=status,
+        changed_at=datetime.utcnow(),
+        changed_by=changed_by
+    ))
+    application.status = status
+    return True
+
+
+def get_status_history(application_id):
+    """Transitions of one application, oldest first"""
+    return ApplicationStatusHistory.query.filter_by(
+        application_id=application_id
+    ).order_by(ApplicationStatusHistory.changed_at, ApplicationStatusHistory.id).all()
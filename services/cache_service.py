@@ -0,0 +1,106 @@
+"""
+Cache Service
+Shared version counters and the in-process cache of rendered page fragments
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from markupsafe import Markup
+
+from core.extensions import db
+from models.cache import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+# Version counter bumped whenever a job is created, edited or toggled
+JOB_SET_VERSION = 'job_set'
+
+FRAGMENT_CACHE_SIZE = 512
+FRAGMENT_TTL_SECONDS = 300
+
+# key -> (expires_at, Markup), least recently used first
+_fragments = OrderedDict()
+_fragments_lock = threading.Lock()
+
+
+def get_cache_version(name):
+    """Current value of a version counter (0 if it was never bumped)"""
+    try:
+        row = db.session.get(CacheVersion, name)
+        return row.version if row else 0
+    except Exception as e:
+        logger.error(f"Error reading cache version {name}: {e}")
+        # Leave the session usable for the rest of the request (on PostgreSQL
+        # a failed statement aborts the whole transaction)
+        db.session.rollback()
+        return None
+
+
+def bump_cache_version(name):
+    """
+    Atomically increment a version counter
+
+    Runs inside the caller's transaction, so caches keyed on the old
+    version stop being used once the caller commits.
+    """
+    dialect = db.engine.dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(CacheVersion).values(name=name, version=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=['name'],
+            set_={'version': CacheVersion.version + 1}
+        )
+        db.session.execute(statement)
+        return
+
+    updated = CacheVersion.query.filter_by(name=name).update(
+        {CacheVersion.version: CacheVersion.version + 1},
+        synchronize_session=False
+    )
+    if not updated:
+        db.session.add(CacheVersion(name=name, version=1))
+
+
+def cached_fragment(key, render):
+    """
+    Get a rendered fragment from the cache, rendering it on a miss
+
+    Args:
+        key: Hashable key; include every version counter and input the
+            fragment depends on
+        render: Callable returning the fragment's HTML
+
+    Returns:
+        Markup
+    """
+    now = time.monotonic()
+    with _fragments_lock:
+        entry = _fragments.get(key)
+        if entry and entry[0] > now:
+            _fragments.move_to_end(key)
+            return entry[1]
+
+    html = Markup(render())
+
+    with _fragments_lock:
+        _fragments[key] = (now + FRAGMENT_TTL_SECONDS, html)
+        _fragments.move_to_end(key)
+        while len(_fragments) > FRAGMENT_CACHE_SIZE:
+            _fragments.popitem(last=False)
+
+    return html
+
+
+def clear_fragments():
+    """Drop every cached fragment in this process"""
+    with _fragments_lock:
+        _fragments.clear()
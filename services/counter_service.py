@@ -0,0 +1,181 @@
+"""
+Counter Service
+Platform-wide counts kept in platform_counter by ORM events, so stats
+read a handful of rows instead of scanning user, job and application
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import and_, case, event, func, inspect, true
+
+from core.extensions import db
+from models.application import Application
+from models.job import Job
+from models.stats import PlatformCounter
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# counter name -> (model, {field: value} a row must match to be counted)
+COUNTERS = {
+    'total_coaches': (User, {'role': 'coach'}),
+    'verified_coaches': (User, {'role': 'coach', 'onboarding_completed': True}),
+    'total_employers': (User, {'role': 'employer'}),
+    'active_employers': (User, {'role': 'employer', 'employer_onboarding_completed': True}),
+    'total_jobs': (Job, {}),
+    'active_jobs': (Job, {'is_active': True}),
+    'total_applications': (Application, {}),
+    'hired_applications': (Application, {'status': 'Hired'}),
+    'interview_applications': (Application, {'status': 'Interview'}),
+}
+
+_events_registered = False
+
+# The unseeded-counters warning is logged once per process
+_missing_counters_logged = False
+
+
+def register_counter_events():
+    """Attach the insert/update/delete listeners that keep the counters current"""
+    global _events_registered
+    if _events_registered:
+        return
+
+    for model in {model for model, _ in COUNTERS.values()}:
+        event.listen(model, 'after_insert', _after_insert)
+        event.listen(model, 'after_update', _after_update)
+        event.listen(model, 'after_delete', _after_delete)
+
+        # Load the old value on assignment even if it was expired, so
+        # _after_update can always see what the row changed from
+        for field in _counted_fields(model):
+            event.listen(getattr(model, field), 'set', _keep_history, active_history=True)
+
+    _events_registered = True
+
+
+def get_counters():
+    """
+    Current counter values
+
+    Read-only: if the counters have not been seeded yet (see
+    migrations/add_platform_counters.sql and reconcile_counters.py) they
+    are counted from the source tables without being stored.
+
+    Returns:
+        dict: {counter name: value}
+    """
+    global _missing_counters_logged
+    values = dict(db.session.query(PlatformCounter.name, PlatformCounter.value).all())
+    if any(name not in values for name in COUNTERS):
+        if not _missing_counters_logged:
+            logger.warning("platform_counter is not seeded; counting from source tables (run reconcile_counters.py)")
+            _missing_counters_logged = True
+        values = count_counters()
+    return values
+
+
+def count_counters():
+    """
+    Count every counter from the source tables, without storing anything
+
+    One conditional-aggregate query per table.
+
+    Returns:
+        dict: {counter name: value}
+    """
+    values = {}
+    for model in {model for model, _ in COUNTERS.values()}:
+        names = [name for name, (counter_model, _) in COUNTERS.items() if counter_model is model]
+        row = db.session.query(*[
+            func.count(case((_condition(model, COUNTERS[name][1]), 1)))
+            for name in names
+        ]).select_from(model).one()
+        values.update(zip(names, row))
+    return values
+
+
+def reconcile_counters():
+    """
+    Recount every counter from the source tables and store the result
+
+    Run periodically (see reconcile_counters.py) to seed the counters and
+    correct drift from bulk writes that skip ORM events; commits.
+
+    Returns:
+        dict: {counter name: value}
+    """
+    values = count_counters()
+
+    now = datetime.utcnow()
+    for name, value in values.items():
+        counter = db.session.get(PlatformCounter, name)
+        if counter is None:
+            db.session.add(PlatformCounter(name=name, value=value, updated_at=now))
+        elif counter.value != value:
+            logger.info(f"Counter {name} reconciled from {counter.value} to {value}")
+            counter.value = value
+            counter.updated_at = now
+
+    db.session.commit()
+    return values
+
+
+def _condition(model, match):
+    if not match:
+        return true()
+    return and_(*[getattr(model, field) == value for field, value in match.items()])
+
+
+def _counted_fields(model):
+    return {field for counter_model, match in COUNTERS.values() if counter_model is model for field in match}
+
+
+def _matches(values, match):
+    return values is not None and all(values.get(field) == value for field, value in match.items())
+
+
+def _apply(connection, model, before, after):
+    """Add the counter deltas between two row states, in the flush's transaction"""
+    table = PlatformCounter.__table__
+    now = datetime.utcnow()
+
+    for name, (counter_model, match) in COUNTERS.items():
+        if counter_model is not model:
+            continue
+        delta = int(_matches(after, match)) - int(_matches(before, match))
+        if delta:
+            connection.execute(
+                table.update()
+                .where(table.c.name == name)
+                .values(value=table.c.value + delta, updated_at=now)
+            )
+
+
+def _keep_history(target, value, oldvalue, initiator):
+    return value
+
+
+def _after_insert(mapper, connection, target):
+    fields = _counted_fields(mapper.class_)
+    _apply(connection, mapper.class_, None, {field: getattr(target, field) for field in fields})
+
+
+def _after_update(mapper, connection, target):
+    fields = _counted_fields(mapper.class_)
+    state = inspect(target)
+
+    before, after = {}, {}
+    for field in fields:
+        history = state.attrs[field].history
+        after[field] = getattr(target, field)
+        before[field] = history.deleted[0] if history.deleted else after[field]
+
+    if before != after:
+        _apply(connection, mapper.class_, before, after)
+
+
+def _after_delete(mapper, connection, target):
+    fields = _counted_fields(mapper.class_)
+    _apply(connection, mapper.class_, {field: getattr(target, field) for field in fields}, None)
@@ -0,0 +1,77 @@
+"""
+Geo Service
+Distance helpers and the fixed lat/lng grid used to index job locations
+"""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+# Grid cell size for Job.geo_cell (~22 km north-south)
+GEO_CELL_DEGREES = 0.2
+GEO_CELLS_PER_ROW = int(360 / GEO_CELL_DEGREES)
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 100
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lng2 - lng1)
+
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def geo_cell_for(lat, lng):
+    """Grid cell id for a coordinate, None if either part is missing"""
+    if lat is None or lng is None:
+        return None
+    row = math.floor((lat + 90) / GEO_CELL_DEGREES)
+    col = math.floor((lng + 180) / GEO_CELL_DEGREES)
+    return row * GEO_CELLS_PER_ROW + col
+
+
+def bounding_box(lat, lng, radius_km):
+    """
+    Lat/lng box that contains every point within radius_km
+
+    Returns:
+        tuple: (min_lat, max_lat, min_lng, max_lng)
+    """
+    d_lat = radius_km / KM_PER_DEGREE
+    d_lng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return lat - d_lat, lat + d_lat, lng - d_lng, lng + d_lng
+
+
+def cells_within(lat, lng, radius_km):
+    """All grid cell ids that overlap the bounding box of a radius search"""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    first_row = math.floor((max(min_lat, -90) + 90) / GEO_CELL_DEGREES)
+    last_row = math.floor((min(max_lat, 90) + 90) / GEO_CELL_DEGREES)
+    first_col = math.floor((min_lng + 180) / GEO_CELL_DEGREES)
+    last_col = math.floor((max_lng + 180) / GEO_CELL_DEGREES)
+
+    return [
+        row * GEO_CELLS_PER_ROW + (col % GEO_CELLS_PER_ROW)
+        for row in range(first_row, last_row + 1)
+        for col in range(first_col, last_col + 1)
+    ]
+
+
+def get_profile_origin(profile):
+    """
+    Search origin for a coach profile
+
+    Returns:
+        tuple: (lat, lng, radius_km), or None if the profile has no coordinates
+    """
+    if not profile or profile.latitude is None or profile.longitude is None:
+        return None
+
+    radius = profile.service_radius_km or profile.range_km or DEFAULT_RADIUS_KM
+    return profile.latitude, profile.longitude, min(max(int(radius), 1), MAX_RADIUS_KM)
@@ -0,0 +1,320 @@
+"""
+Job Index Service
+Keeps derived job columns and indexes (salary bounds, geo grid cell,
+filter facet counts, full-text search, match-scoring columns, job-set
+version) in step with job writes
+"""
+
+import logging
+import re
+
+from sqlalchemy import func, inspect, text
+
+from core.extensions import db
+from models.job import Job, JobFacetCount
+from services.cache_service import JOB_SET_VERSION, bump_cache_version
+from services.geo_service import geo_cell_for
+from services.match_service import mark_job_columns_stale
+
+logger = logging.getLogger(__name__)
+
+# Job columns exposed as filter facets on /jobs
+FACET_FIELDS = ('sport', 'job_type', 'city', 'state')
+
+# Job columns covered by full-text search, in FTS column order
+SEARCH_FIELDS = ('title', 'required_skills', 'description', 'requirements')
+
+# Set once the SQLite FTS5 table is known to exist in this process
+_text_index_ready = False
+
+# "25000", "25,000", "25k", "2.5 lakh", "3L", "15 LPA", optionally a range
+# ("25-40k", "25000 to 40000") followed by the word after it
+_SALARY_AMOUNT = r"(\d+(?:,\d+)*(?:\.\d+)?)\s*(lpa|k|thousand|lakhs?|lacs?|l)?\b"
+SALARY_AMOUNT_PATTERN = re.compile(
+    _SALARY_AMOUNT + r"(?:\s*(?:-|–|—|to)\s*" + _SALARY_AMOUNT + r")?\s*\+?\s*([a-z]*)",
+    re.IGNORECASE
+)
+SALARY_UNITS = {'k': 1000, 'thousand': 1000, 'l': 100000, 'lac': 100000, 'lacs': 100000,
+                'lakh': 100000, 'lakhs': 100000, 'lpa': 100000}
+
+# Annual salaries ("15 LPA", "12 lakh per annum", "3,00,000 p.a.") are
+# stored per month, like every other salary, so filters and sorting compare
+# one period
+ANNUAL_UNITS = {'lpa'}
+ANNUAL_PATTERN = re.compile(
+    r"[\s,]*(?:per\s+annum|per\s+year|a\s+year|p\.?\s?a\b\.?|/\s*(?:annum|year|yr)\b|annual(?:ly)?|yearly)",
+    re.IGNORECASE
+)
+MONTHS_PER_YEAR = 12
+
+# Numbers followed by these words are not salaries ("3-5 years", "2 yrs exp")
+NON_SALARY_WORDS = {'year', 'years', 'yr', 'yrs', 'exp', 'experience', 'month', 'months',
+                    'week', 'weeks', 'day', 'days', 'hour', 'hours', 'hr', 'hrs'}
+
+
+def snapshot_job(job):
+    """
+    Capture the indexed fields of a job before it is modified
+
+    Call this before changing a job and pass the result to reindex_job
+    so the indexes can remove the old values.
+    """
+    return {
+        'is_active': bool(job.is_active),
+        **{field: getattr(job, field) for field in FACET_FIELDS}
+    }
+
+
+def reindex_job(job, before=None):
+    """
+    Update every derived index for a created or modified job
+
+    Runs inside the caller's transaction; the caller commits. Stored
+    coach matches are refreshed separately, after the commit, with
+    match_service.queue_job_matching.
+
+    Args:
+        job: Job that was added or changed (already in the session)
+        before: snapshot_job() result taken before the change, None for new jobs
+    """
+    set_salary_bounds(job)
+    job.geo_cell = geo_cell_for(job.lat, job.lng)
+    update_job_facets(before, snapshot_job(job))
+    index_job_text(job)
+    mark_job_columns_stale()
+    bump_cache_version(JOB_SET_VERSION)
+
+
+def parse_salary_range(salary_range):
+    """
+    Parse a free-text salary into integer bounds
+
+    Amounts are monthly; annual ones are divided by 12.
+
+    Examples:
+        "25000 - 40000"           -> (25000, 40000)
+        "₹25,000 to 40,000"       -> (25000, 40000)
+        "25k-40k", "25-40k"       -> (25000, 40000)
+        "15 LPA"                  -> (125000, 125000)
+        "6 lakh per annum"        -> (50000, 50000)
+        "30000"                   -> (30000, 30000)
+        "3-5 years, 20000/month"  -> (20000, 20000)
+        "Negotiable"              -> (None, None)
+
+    Returns:
+        tuple: (salary_min, salary_max) per month
+    """
+    if not salary_range:
+        return None, None
+
+    amounts = []
+    for match in SALARY_AMOUNT_PATTERN.finditer(salary_range):
+        low, low_unit, high, high_unit, word = match.groups()
+        if word.lower() in NON_SALARY_WORDS:
+            continue
+
+        numbers = [(low, low_unit)]
+        if high:
+            # "25-40k": the trailing unit applies to a bare leading number
+            # on the same scale (but not to "25000 - 40k")
+            if not low_unit and high_unit and _salary_number(low) <= _salary_number(high):
+                low_unit = high_unit
+            numbers = [(low, low_unit), (high, high_unit)]
+
+        # "per annum" etc. right after the amount (the trailing word is
+        # part of the match, so look from where the amounts end)
+        amounts_end = match.end(4) if high else match.end(2) if low_unit else match.end(1)
+        annual = (
+            any(unit and unit.lower() in ANNUAL_UNITS for _, unit in numbers)
+            or bool(ANNUAL_PATTERN.match(salary_range, amounts_end))
+        )
+
+        for number, unit in numbers:
+            amount = _salary_amount(number, unit)
+            amounts.append(amount // MONTHS_PER_YEAR if annual else amount)
+
+    amounts = [amount for amount in amounts if amount >= 1]
+    if not amounts:
+        return None, None
+    return min(amounts[:2]), max(amounts[:2])
+
+
+def _salary_number(number):
+    return float(number.replace(',', ''))
+
+
+def _salary_amount(number, unit):
+    return int(_salary_number(number) * (SALARY_UNITS.get(unit.lower(), 1) if unit else 1))
+
+
+def set_salary_bounds(job):
+    """Refresh job.salary_min / salary_max from job.salary_range"""
+    job.salary_min, job.salary_max = parse_salary_range(job.salary_range)
+
+
+def update_job_facets(before, after):
+    """Apply the facet count delta between two job snapshots"""
+    delta = {}
+    for snapshot, step in ((before, -1), (after, 1)):
+        for key in _facet_keys(snapshot):
+            delta[key] = delta.get(key, 0) + step
+
+    for (facet, value), step in delta.items():
+        if step:
+            _bump_facet(facet, value, step)
+
+
+def get_job_facets():
+    """
+    Get facet values with active-job counts in a single query
+
+    Returns:
+        dict: {'sport': [{'value': 'Cricket', 'count': 12}, ...], 'job_type': [...], ...}
+    """
+    facets = {field: [] for field in FACET_FIELDS}
+    try:
+        rows = JobFacetCount.query.filter(JobFacetCount.count > 0).order_by(
+            JobFacetCount.facet, JobFacetCount.count.desc(), JobFacetCount.value
+        ).all()
+        for row in rows:
+            if row.facet in facets:
+                facets[row.facet].append({'value': row.value, 'count': row.count})
+    except Exception as e:
+        logger.error(f"Error loading job facets: {e}")
+    return facets
+
+
+def rebuild_job_facets():
+    """Recount all facets from the job table (backfill / reconciliation)"""
+    JobFacetCount.query.delete(synchronize_session=False)
+
+    for field in FACET_FIELDS:
+        column = getattr(Job, field)
+        rows = db.session.query(column, func.count(Job.id)).filter(
+            Job.is_active == True,
+            column.isnot(None),
+            column != ''
+        ).group_by(column).all()
+
+        for value, count in rows:
+            db.session.add(JobFacetCount(facet=field, value=value, count=count))
+
+    db.session.commit()
+
+
+def ensure_job_text_index(commit=True):
+    """
+    Make sure the full-text index for jobs exists
+
+    PostgreSQL keeps job.search_vector as a generated column with a GIN
+    index (see migrations/add_job_fulltext_search.sql); it is only checked
+    for, so search falls back to keywords until the migration is applied.
+    On SQLite an FTS5 table is created and backfilled the
+    first time it is needed.
+
+    Args:
+        commit: Commit the creation; pass False when already inside a
+            write transaction that the caller will commit
+
+    Returns:
+        bool: True if full-text search is available
+    """
+    global _text_index_ready
+
+    if _text_index_ready:
+        return True
+
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        try:
+            columns = {column['name'] for column in inspect(db.engine).get_columns('job')}
+            _text_index_ready = 'search_vector' in columns
+            if not _text_index_ready:
+                logger.warning("job.search_vector missing; apply migrations/add_job_fulltext_search.sql")
+        except Exception as e:
+            logger.warning(f"Full-text job index unavailable: {e}")
+        return _text_index_ready
+    if dialect != 'sqlite':
+        return False
+
+    try:
+        exists = db.session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_fts'"
+        )).first()
+        if not exists:
+            columns = ", ".join(SEARCH_FIELDS)
+            db.session.execute(text(f"CREATE VIRTUAL TABLE job_fts USING fts5({columns})"))
+            db.session.execute(text(
+                f"INSERT INTO job_fts (rowid, {columns}) SELECT id, {columns} FROM job"
+            ))
+            if commit:
+                db.session.commit()
+        _text_index_ready = True
+    except Exception as e:
+        if commit:
+            db.session.rollback()
+        logger.warning(f"Full-text job index unavailable: {e}")
+
+    return _text_index_ready
+
+
+def index_job_text(job):
+    """Write a job's searchable text into the SQLite FTS5 table"""
+    if db.engine.dialect.name != 'sqlite':
+        return
+
+    if job.id is None:
+        db.session.flush()
+
+    if not ensure_job_text_index(commit=False):
+        return
+
+    global _text_index_ready
+
+    columns = ", ".join(SEARCH_FIELDS)
+    params = ", ".join(f":{field}" for field in SEARCH_FIELDS)
+    try:
+        db.session.execute(
+            text(f"INSERT OR REPLACE INTO job_fts (rowid, {columns}) VALUES (:id, {params})"),
+            {'id': job.id, **{field: getattr(job, field) or '' for field in SEARCH_FIELDS}}
+        )
+    except Exception as e:
+        _text_index_ready = False
+        logger.warning(f"Error indexing job {job.id} text: {e}")
+
+
+def _facet_keys(snapshot):
+    """(facet, value) pairs a job snapshot contributes to; inactive jobs contribute none"""
+    if not snapshot or not snapshot.get('is_active'):
+        return []
+    return [
+        (field, snapshot[field])
+        for field in FACET_FIELDS
+        if snapshot.get(field)
+    ]
+
+
+def _bump_facet(facet, value, step):
+    """Atomically add step to a facet counter, creating the row if needed"""
+    dialect = db.engine.dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(JobFacetCount).values(facet=facet, value=value, count=max(step, 0))
+        statement = statement.on_conflict_do_update(
+            index_elements=['facet', 'value'],
+            set_={'count': JobFacetCount.count + step}
+        )
+        db.session.execute(statement)
+        return
+
+    updated = JobFacetCount.query.filter_by(facet=facet, value=value).update(
+        {JobFacetCount.count: JobFacetCount.count + step},
+        synchronize_session=False
+    )
+    if not updated and step > 0:
+        db.session.add(JobFacetCount(facet=facet, value=value, count=step))
@@ -0,0 +1,483 @@
+"""
+Job Search Service
+Builds filtered job listings and keyset (cursor) pagination for /jobs and /api/jobs
+"""
+
+import base64
+import json
+import math
+import re
+from datetime import datetime
+
+from sqlalchemy import and_, or_, false, text
+
+from core.extensions import db
+from models.job import Job
+from services.geo_service import KM_PER_DEGREE, bounding_box, cells_within, haversine_km
+from services.job_index_service import ensure_job_text_index
+from services.match_service import filter_mask, get_job_columns, top_matching_jobs
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 50
+
+
+class KeysetPagination:
+    """
+    One page of a keyset-paginated listing.
+
+    Exposes the same has_prev/has_next shape the templates already use,
+    with opaque page tokens instead of page numbers.
+    """
+
+    def __init__(self, items, per_page, next_token=None, prev_token=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_token = next_token
+        self.prev_token = prev_token
+        self.has_next = next_token is not None
+        self.has_prev = prev_token is not None
+
+
+def get_listing_order():
+    """Sort keys for the job listing: newest first, id as tie-breaker"""
+    return [(Job.posted_date, False), (Job.id, False)]
+
+
+def search_jobs(filters, page_token=None, per_page=DEFAULT_PER_PAGE, origin=None, profile=None):
+    """
+    Get one page of active jobs for the given filters
+
+    Keyword searches (filters['q']) are ranked by relevance, "within my
+    range" searches (filters['near'] with an origin) nearest first, and
+    everything else newest first. filters['sort'] can override this with
+    'salary', 'distance', 'newest' or 'match' (best match for profile).
+
+    Args:
+        filters: Result of build_job_filters
+        page_token: Opaque token from a previous page
+        per_page: Page size
+        origin: (lat, lng, radius_km) for the range search, see geo_service.get_profile_origin
+        profile: Coach profile, required for the 'match' sort
+
+    Returns:
+        KeysetPagination
+    """
+    if filters.get('sort') == 'match' and profile is not None:
+        return paginate_jobs_by_match(filters, profile, page_token, per_page, origin)
+
+    query = build_job_query(filters)
+    sort, order = 'newest', get_listing_order()
+
+    if _search_terms(filters.get('q', '')):
+        match = job_text_match(filters['q'])
+        if match is not None:
+            query = query.join(match, match.c.job_id == Job.id).add_columns(match.c.score)
+            sort, order = 'relevance', [(match.c.score, True), (Job.id, True)]
+        else:
+            query = query.filter(_keyword_fallback(filters['q']))
+
+    if filters.get('near') and origin:
+        distance = _distance_sq(origin[0], origin[1]).label('distance_sq')
+        query = _filter_within_radius(query, origin).add_columns(distance)
+        if filters.get('sort') == 'distance' or (not filters.get('sort') and sort == 'newest'):
+            sort, order = 'distance', [(distance, True), (Job.id, True)]
+
+    if filters.get('sort') == 'salary':
+        sort, order = 'salary', [(Job.salary_max, False), (Job.id, False)]
+    elif filters.get('sort') == 'newest':
+        sort, order = 'newest', get_listing_order()
+
+    return paginate_jobs(query, page_token, per_page, order=order, sort=sort)
+
+
+def paginate_jobs_by_match(filters, profile, page_token=None, per_page=DEFAULT_PER_PAGE, origin=None):
+    """
+    Fetch one page of jobs ranked by match score for a coach
+
+    Scores every active job in memory (see match_service) and loads only
+    the page's jobs from the database. Tokens carry the (score, id) of
+    the boundary job, like the SQL keyset tokens.
+
+    Returns:
+        KeysetPagination
+    """
+    per_page = max(1, min(int(per_page or DEFAULT_PER_PAGE), MAX_PER_PAGE))
+    cursor = decode_page_token(page_token)
+    if cursor and (cursor.get('s') != 'match' or len(cursor['k']) != 2):
+        cursor = None
+    direction = cursor['d'] if cursor else 'next'
+
+    columns = get_job_columns()
+    mask = filter_mask(columns, filters, origin, _keyword_job_ids(filters.get('q', '')))
+    ranked = top_matching_jobs(
+        profile,
+        per_page + 1,
+        mask=mask,
+        after=cursor['k'] if direction == 'next' and cursor else None,
+        before=cursor['k'] if direction == 'prev' else None,
+        columns=columns
+    )
+
+    has_more = len(ranked) > per_page
+    ranked = ranked[1:] if direction == 'prev' and has_more else ranked[:per_page]
+    if not ranked:
+        return KeysetPagination([], per_page)
+
+    # Columns may be a little stale, so recheck is_active on the page itself
+    jobs = {
+        job.id: job
+        for job in Job.query.filter(Job.id.in_([job_id for job_id, _ in ranked]), Job.is_active == True)
+    }
+    items = [jobs[job_id] for job_id, _ in ranked if job_id in jobs]
+
+    first_key = [ranked[0][1], ranked[0][0]]
+    last_key = [ranked[-1][1], ranked[-1][0]]
+
+    if direction == 'prev':
+        next_token = encode_page_token(last_key, 'next', 'match')
+        prev_token = encode_page_token(first_key, 'prev', 'match') if has_more else None
+    else:
+        next_token = encode_page_token(last_key, 'next', 'match') if has_more else None
+        prev_token = encode_page_token(first_key, 'prev', 'match') if cursor else None
+
+    return KeysetPagination(items, per_page, next_token, prev_token)
+
+
+def job_distances(jobs, origin):
+    """Haversine distance in km from the search origin to each geocoded job"""
+    if not origin:
+        return {}
+    return {
+        job.id: round(haversine_km(origin[0], origin[1], job.lat, job.lng), 1)
+        for job in jobs
+        if job.lat is not None and job.lng is not None
+    }
+
+
+def job_text_match(q):
+    """
+    Full-text match of q against job text as a (job_id, score) subquery
+
+    Lower scores rank higher: SQLite returns FTS5 bm25() directly and
+    PostgreSQL returns the negated ts_rank_cd() of the weighted
+    search_vector, so both sort ascending.
+
+    Returns:
+        Subquery, or None when full-text search is unavailable
+    """
+    terms = _search_terms(q)
+    if not terms or not ensure_job_text_index():
+        return None
+
+    if db.engine.dialect.name == 'postgresql':
+        statement = text(
+            "SELECT job.id AS job_id, "
+            "CAST(-ts_rank_cd(job.search_vector, query) AS DOUBLE PRECISION) AS score "
+            "FROM job, to_tsquery('english', :query) AS query "
+            "WHERE job.search_vector @@ query"
+        ).bindparams(query=" & ".join(f"{term}:*" for term in terms))
+    else:
+        statement = text(
+            "SELECT rowid AS job_id, bm25(job_fts, 10.0, 5.0, 1.0, 1.0) AS score "
+            "FROM job_fts WHERE job_fts MATCH :query"
+        ).bindparams(query=" ".join(f'"{term}"*' for term in terms))
+
+    return statement.columns(job_id=db.Integer, score=db.Float).subquery("job_text_hits")
+
+
+def build_job_filters(args):
+    """
+    Normalize /jobs query parameters into a filters dict
+
+    Args:
+        args: request.args (or any mapping)
+
+    Returns:
+        dict: Normalized filter values
+    """
+    return {
+        'sport': args.get('sport', 'All') or 'All',
+        'city': (args.get('city', '') or '').strip(),
+        'state': args.get('state', 'All') or 'All',
+        'job_type': args.get('job_type', 'All') or 'All',
+        'min_salary': (args.get('min_salary', '') or '').strip(),
+        'q': (args.get('q', '') or '').strip()[:200],
+        'sort': args.get('sort') if args.get('sort') in ('salary', 'distance', 'newest', 'match') else '',
+        'near': '1' if args.get('near') else '',
+    }
+
+
+def build_job_query(filters):
+    """Build the active-job query for the given filters"""
+    query = Job.query.filter(Job.is_active == True)
+
+    if filters['sport'] != 'All':
+        query = query.filter(Job.sport == filters['sport'])
+
+    if filters['city']:
+        query = query.filter(Job.location.ilike(f"%{filters['city']}%"))
+
+    if filters['state'] != 'All':
+        query = query.filter(Job.state == filters['state'])
+
+    if filters['job_type'] != 'All':
+        query = query.filter(Job.job_type == filters['job_type'])
+
+    min_salary = _parse_int(filters.get('min_salary'))
+    if min_salary:
+        # Jobs whose advertised range reaches the requested amount
+        query = query.filter(Job.salary_max >= min_salary)
+
+    return query
+
+
+def paginate_jobs(query, page_token=None, per_page=DEFAULT_PER_PAGE, order=None, sort='newest'):
+    """
+    Fetch one page of jobs using keyset pagination
+
+    The cost of a page depends only on per_page, not on how deep the
+    page is, because the cursor is turned into a WHERE clause on the
+    sort keys instead of an OFFSET.
+
+    Args:
+        query: Filtered Job query
+        page_token: Opaque token from a previous page (None for first page)
+        per_page: Page size
+        order: List of (column, ascending) sort keys ending with a unique column;
+            keys that are not Job columns must also be selected on the query
+        sort: Name of the ordering, stored in tokens so a token from a
+            different ordering is ignored
+
+    Returns:
+        KeysetPagination
+    """
+    order = order or get_listing_order()
+    per_page = max(1, min(int(per_page or DEFAULT_PER_PAGE), MAX_PER_PAGE))
+    cursor = decode_page_token(page_token)
+    if cursor and cursor.get('s', 'newest') != sort:
+        cursor = None
+    direction = cursor['d'] if cursor else 'next'
+
+    if cursor:
+        query = query.filter(_keyset_condition(order, cursor['k'], direction))
+
+    query = query.order_by(*_order_clauses(order, reverse=(direction == 'prev')))
+    rows = query.limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == 'prev':
+        rows.reverse()
+
+    items = [row if isinstance(row, Job) else row[0] for row in rows]
+    if not items:
+        return KeysetPagination(items, per_page)
+
+    first_key = _row_key(rows[0], order)
+    last_key = _row_key(rows[-1], order)
+
+    if direction == 'prev':
+        next_token = encode_page_token(last_key, 'next', sort)
+        prev_token = encode_page_token(first_key, 'prev', sort) if has_more else None
+    else:
+        next_token = encode_page_token(last_key, 'next', sort) if has_more else None
+        prev_token = encode_page_token(first_key, 'prev', sort) if cursor else None
+
+    return KeysetPagination(items, per_page, next_token, prev_token)
+
+
+def encode_page_token(key_values, direction, sort='newest'):
+    """Encode sort-key values and direction into a URL-safe token"""
+    payload = {'k': [_encode_value(v) for v in key_values], 'd': direction, 's': sort}
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_page_token(token):
+    """Decode a page token; invalid or missing tokens return None"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload.get('d') not in ('next', 'prev') or not isinstance(payload.get('k'), list):
+            return None
+        payload['k'] = [_decode_value(v) for v in payload['k']]
+        return payload
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def job_to_dict(job):
+    """Serialize a Job for JSON listings"""
+    return {
+        'id': job.id,
+        'title': job.title,
+        'sport': job.sport,
+        'location': job.location,
+        'city': job.city,
+        'state': job.state,
+        'job_type': job.job_type,
+        'salary_range': job.salary_range,
+        'salary_min': job.salary_min,
+        'salary_max': job.salary_max,
+        'description': job.description,
+        'employer': job.employer.username if job.employer else None,
+        'posted_date': job.posted_date.isoformat() if job.posted_date else None,
+        'lat': job.lat,
+        'lng': job.lng,
+    }
+
+
+def _order_clauses(order, reverse=False):
+    """ORDER BY clauses for the sort keys, NULLs always at the end of the listing"""
+    clauses = []
+    for column, ascending in order:
+        if ascending != reverse:
+            clause = column.asc()
+        else:
+            clause = column.desc()
+        # NOT NULL keys keep a plain ORDER BY, so the newest-first listing
+        # matches idx_job_active_posted (is_active, posted_date DESC, id DESC)
+        if _nullable(column):
+            clause = clause.nullsfirst() if reverse else clause.nullslast()
+        clauses.append(clause)
+    return clauses
+
+
+def _keyset_condition(order, values, direction):
+    """WHERE clause selecting rows strictly after (or before) the cursor"""
+    if len(values) != len(order):
+        return false()
+
+    branches = []
+    for index, (column, ascending) in enumerate(order):
+        equal_prefix = [
+            _equals(order_column, values[i])
+            for i, (order_column, _) in enumerate(order[:index])
+        ]
+        if direction == 'next':
+            step = _after(column, values[index], ascending)
+        else:
+            step = _before(column, values[index], ascending)
+        branches.append(and_(*equal_prefix, step))
+
+    return or_(*branches)
+
+
+def _equals(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _after(column, value, ascending):
+    """Rows that sort after value (NULLs sort last)"""
+    if value is None:
+        return false()
+    beyond = column > value if ascending else column < value
+    return or_(beyond, column.is_(None)) if _nullable(column) else beyond
+
+
+def _before(column, value, ascending):
+    """Rows that sort before value (NULLs sort last)"""
+    if value is None:
+        return column.isnot(None)
+    return column < value if ascending else column > value
+
+
+def _row_key(row, order):
+    """Read the sort-key values back off a result row"""
+    if isinstance(row, Job):
+        return [getattr(row, column.key) for column, _ in order]
+
+    job = row[0]
+    return [
+        getattr(job, column.key) if hasattr(column, 'class_') else row._mapping[column]
+        for column, _ in order
+    ]
+
+
+def _filter_within_radius(query, origin):
+    """
+    Restrict a job query to jobs within origin's radius
+
+    The geo_cell IN (...) prefilter uses the grid index so only the few
+    cells around the origin are read; the lat/lng box and the distance
+    check then refine that to the exact circle.
+    """
+    lat, lng, radius_km = origin
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    return query.filter(
+        Job.geo_cell.in_(cells_within(lat, lng, radius_km)),
+        Job.lat.between(min_lat, max_lat),
+        Job.lng.between(min_lng, max_lng),
+        _distance_sq(lat, lng) <= radius_km * radius_km
+    )
+
+
+def _distance_sq(lat, lng):
+    """
+    Squared distance in km^2 from (lat, lng) to each job, as SQL
+
+    Uses the local flat-earth (equirectangular) approximation, which is
+    plain arithmetic and so works on every database; within the 100 km
+    search limit it stays within a fraction of a percent of haversine.
+    """
+    lng_scale = KM_PER_DEGREE * math.cos(math.radians(lat))
+    d_lat = (Job.lat - lat) * KM_PER_DEGREE
+    d_lng = (Job.lng - lng) * lng_scale
+    return d_lat * d_lat + d_lng * d_lng
+
+
+def _parse_int(value):
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _search_terms(q):
+    """Split a search box value into safe lowercase word terms"""
+    return re.findall(r"\w+", q.lower())[:10]
+
+
+def _keyword_job_ids(q):
+    """Ids of jobs matching a keyword search, None when there is no search"""
+    if not _search_terms(q):
+        return None
+
+    match = job_text_match(q)
+    if match is not None:
+        return [row.job_id for row in db.session.query(match.c.job_id)]
+    return [row.id for row in db.session.query(Job.id).filter(_keyword_fallback(q))]
+
+
+def _keyword_fallback(q):
+    """Substring match used when no full-text index is available"""
+    clauses = []
+    for term in _search_terms(q):
+        pattern = f"%{term}%"
+        clauses.append(or_(
+            Job.title.ilike(pattern),
+            Job.description.ilike(pattern),
+            Job.requirements.ilike(pattern),
+            Job.required_skills.ilike(pattern)
+        ))
+    return and_(*clauses) if clauses else false()
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def _nullable(column):
+    """Whether a sort key can be NULL (expressions are assumed to be)"""
+    return getattr(getattr(column, 'expression', column), 'nullable', True)
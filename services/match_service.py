@@ -0,0 +1,499 @@
+"""
+Match Service
+Vectorized match scoring of coach profiles against active jobs, and the
+materialized job_match table built from it
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import and_, event, or_
+from sqlalchemy.orm import Session
+
+from core.extensions import db, socketio
+from models.job import Job, JobMatch
+from models.profile import Profile
+from models.user import User
+from services.ai_service import (
+    SPORT_MATCH_POINTS, LOCATION_MATCH_POINTS, EXPERIENCE_POINTS, CERTIFICATION_POINTS,
+    has_sufficient_experience
+)
+from services.geo_service import EARTH_RADIUS_KM, MAX_RADIUS_KM, bounding_box, get_profile_origin
+
+logger = logging.getLogger(__name__)
+
+# How long a process reuses the loaded job columns before reading them again
+JOB_COLUMNS_TTL_SECONDS = 60
+
+# Ranking key is score * MATCH_KEY_SPAN + job id, so ties break on id
+MATCH_KEY_SPAN = 1 << 32
+
+# Profile fields that feed calculate_match_score or decide if a pair is stored
+PROFILE_MATCH_FIELDS = (
+    'sport', 'city', 'experience_years', 'certifications',
+    'latitude', 'longitude', 'range_km', 'service_radius_km', 'job_types'
+)
+
+# Job.job_type values a coach can opt out of via Profile.job_types
+JOB_TYPE_PREFERENCES = {'Full Time': 'full_time', 'Part Time': 'part_time'}
+
+_job_columns = None
+_job_columns_lock = threading.Lock()
+
+_events_registered = False
+
+# Serializes background job matching in this process
+_job_matching_lock = threading.Lock()
+
+
+class JobColumns:
+    """
+    The active job set as parallel NumPy arrays, one entry per job.
+
+    Text columns are stored as integer codes so that comparing every job
+    against a profile value is a single array comparison.
+    """
+
+    def __init__(self, rows):
+        self.loaded_at = time.monotonic()
+        self.ids = np.array([row.id for row in rows], dtype=np.int64)
+        self.codes = {}
+        for field in ('sport', 'city', 'state', 'job_type'):
+            setattr(self, field, self._encode(field, [getattr(row, field) for row in rows]))
+        self.lat = np.array([_float(row.lat) for row in rows], dtype=np.float64)
+        self.lng = np.array([_float(row.lng) for row in rows], dtype=np.float64)
+        self.salary_max = np.array([_float(row.salary_max) for row in rows], dtype=np.float64)
+        self.location = np.array([(row.location or '').lower() for row in rows], dtype=str)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def code(self, field, value):
+        """Integer code of value in a text column, -1 if no job has it"""
+        return self.codes[field].get(value, -1)
+
+    def _encode(self, field, values):
+        codes = self.codes[field] = {}
+        return np.array([codes.setdefault(value, len(codes)) for value in values], dtype=np.int32)
+
+
+def get_job_columns(max_age=JOB_COLUMNS_TTL_SECONDS):
+    """
+    Get the active job columns, reloading them once they are older than max_age
+
+    Args:
+        max_age: Seconds a loaded copy may be reused; 0 always reads the database
+
+    Returns:
+        JobColumns
+    """
+    global _job_columns
+
+    columns = _job_columns
+    if columns is not None and time.monotonic() - columns.loaded_at < max_age:
+        return columns
+
+    with _job_columns_lock:
+        columns = _job_columns
+        if columns is None or time.monotonic() - columns.loaded_at >= max_age:
+            rows = db.session.query(
+                Job.id, Job.sport, Job.city, Job.state, Job.job_type,
+                Job.lat, Job.lng, Job.salary_max, Job.location
+            ).filter(Job.is_active == True).all()
+            columns = _job_columns = JobColumns(rows)
+            logger.info(f"Loaded {len(columns)} active jobs for match scoring")
+
+    return columns
+
+
+def invalidate_job_columns():
+    """Drop this process's job columns so the next ranking reloads them"""
+    global _job_columns
+    _job_columns = None
+
+
+def mark_job_columns_stale(session=None):
+    """
+    Drop the job columns once the caller's transaction commits
+
+    Dropping them before the commit would let a concurrent request reload
+    the old rows and keep them for the whole TTL.
+    """
+    (session or db.session).info['job_columns_stale'] = True
+
+
+def register_match_events():
+    """Attach the listeners that apply mark_job_columns_stale() on commit"""
+    global _events_registered
+    if _events_registered:
+        return
+
+    event.listen(Session, 'after_commit', _drop_stale_job_columns)
+    event.listen(Session, 'after_rollback', _keep_job_columns)
+
+    _events_registered = True
+
+
+def _drop_stale_job_columns(session):
+    if session.info.pop('job_columns_stale', False):
+        invalidate_job_columns()
+
+
+def _keep_job_columns(session):
+    session.info.pop('job_columns_stale', None)
+
+
+def score_jobs(profile, columns):
+    """
+    Match score of profile against every job in one pass
+
+    Uses the same rules and weights as ai_service.calculate_match_score.
+
+    Returns:
+        numpy.ndarray: Scores aligned with columns.ids
+    """
+    scores = np.full(len(columns), profile_base_score(profile), dtype=np.int64)
+    scores += SPORT_MATCH_POINTS * (columns.sport == columns.code('sport', profile.sport))
+
+    location_match = np.zeros(len(columns), dtype=bool)
+    if profile.city:
+        location_match |= columns.city == columns.code('city', profile.city)
+
+    origin = get_profile_origin(profile)
+    if origin:
+        location_match |= distances_km(columns, origin[0], origin[1]) <= origin[2]
+
+    scores += LOCATION_MATCH_POINTS * location_match
+    return scores
+
+
+def profile_base_score(profile):
+    """The part of a match score that depends only on the coach (experience, certifications)"""
+    base = 0
+    if has_sufficient_experience(profile):
+        base += EXPERIENCE_POINTS
+    if profile.certifications:
+        base += CERTIFICATION_POINTS
+    return base
+
+
+def distances_km(columns, lat, lng):
+    """Haversine distance from (lat, lng) to every job; NaN for jobs without coordinates"""
+    return _haversine_km(columns.lat, columns.lng, lat, lng)
+
+
+def filter_mask(columns, filters, origin=None, job_ids=None):
+    """
+    Boolean mask of the jobs that pass the /jobs filters
+
+    Mirrors job_search_service.build_job_query on the column arrays.
+
+    Args:
+        columns: JobColumns
+        filters: Result of job_search_service.build_job_filters
+        origin: (lat, lng, radius_km), applied when filters['near'] is set
+        job_ids: Optional ids to restrict to (e.g. keyword matches)
+    """
+    mask = np.ones(len(columns), dtype=bool)
+
+    for field in ('sport', 'state', 'job_type'):
+        if filters.get(field, 'All') != 'All':
+            mask &= getattr(columns, field) == columns.code(field, filters[field])
+
+    if filters.get('city'):
+        mask &= np.char.find(columns.location, filters['city'].lower()) >= 0
+
+    try:
+        min_salary = int(filters.get('min_salary') or 0)
+    except (TypeError, ValueError):
+        min_salary = 0
+    if min_salary:
+        mask &= columns.salary_max >= min_salary
+
+    if filters.get('near') and origin:
+        mask &= distances_km(columns, origin[0], origin[1]) <= origin[2]
+
+    if job_ids is not None:
+        mask &= np.isin(columns.ids, np.fromiter(job_ids, dtype=np.int64))
+
+    return mask
+
+
+def top_matching_jobs(profile, k, mask=None, after=None, before=None, columns=None):
+    """
+    The k best-matching jobs for a coach, best first
+
+    Ties on score are broken by newer (higher) job id. Pass the
+    (score, job_id) of a boundary job as after/before to continue the
+    ranking from there.
+
+    Returns:
+        list: [(job_id, score), ...] ordered by score desc, id desc
+    """
+    columns = columns if columns is not None else get_job_columns()
+    if not len(columns) or k <= 0:
+        return []
+
+    scores = score_jobs(profile, columns)
+    keys = scores * MATCH_KEY_SPAN + columns.ids
+
+    eligible = mask.copy() if mask is not None else np.ones(len(columns), dtype=bool)
+    if after is not None:
+        eligible &= keys < after[0] * MATCH_KEY_SPAN + after[1]
+    if before is not None:
+        eligible &= keys > before[0] * MATCH_KEY_SPAN + before[1]
+
+    candidates = np.flatnonzero(eligible)
+    if len(candidates) > k:
+        # Jobs nearest the cursor: smallest keys going back, largest going forward
+        candidate_keys = keys[candidates] if before is not None else -keys[candidates]
+        candidates = candidates[np.argpartition(candidate_keys, k - 1)[:k]]
+
+    candidates = candidates[np.argsort(-keys[candidates])]
+    return [(int(columns.ids[i]), int(scores[i])) for i in candidates]
+
+
+def snapshot_profile(profile):
+    """
+    Capture the match-relevant fields of a profile before it is modified
+
+    Pass the result to refresh_coach_matches so unchanged profiles are skipped.
+    """
+    return tuple(getattr(profile, field) for field in PROFILE_MATCH_FIELDS)
+
+
+def refresh_coach_matches(profile, before=None, columns=None):
+    """
+    Rewrite the stored matches of one coach after a profile change
+
+    Runs inside the caller's transaction; the caller commits.
+
+    Args:
+        profile: Coach Profile (already in the session)
+        before: snapshot_profile() result taken before the change
+        columns: JobColumns to score against; the shared cached copy when omitted
+    """
+    # Only coaches are matched to jobs
+    if profile.user is None or profile.user.role != 'coach':
+        return
+
+    if before is not None and before == snapshot_profile(profile):
+        return
+
+    from services.recommendation_service import mark_recommendations_stale
+    mark_recommendations_stale(profile.user_id)
+
+    JobMatch.query.filter_by(user_id=profile.user_id).delete(synchronize_session=False)
+
+    # The cached columns (reloaded when jobs change) keep a profile edit to
+    # one vectorized pass, without reading every active job
+    columns = columns if columns is not None else get_job_columns()
+    scores = score_jobs(profile, columns)
+    matched = np.flatnonzero((scores > profile_base_score(profile)) & _accepted_job_types_mask(profile, columns))
+
+    now = datetime.utcnow()
+    _insert_matches([
+        {'job_id': int(columns.ids[i]), 'user_id': profile.user_id, 'score': int(scores[i]), 'updated_at': now}
+        for i in matched
+    ])
+
+
+def refresh_job_matches(job):
+    """
+    Rewrite the stored matches of one job after it is created or changed
+
+    Reverse matching: coach profiles are narrowed with indexed prefilters
+    (same sport, same city, or inside the largest search radius, and
+    accepting the job type), then the remaining candidates are scored
+    in one NumPy pass. Runs inside the caller's transaction; the caller
+    commits. Routes use queue_job_matching to run it off the request.
+    """
+    if job.id is None:
+        db.session.flush()
+
+    JobMatch.query.filter_by(job_id=job.id).delete(synchronize_session=False)
+    if not job.is_active:
+        return
+
+    candidates = _candidate_profiles(job)
+    if not candidates:
+        return
+
+    scores, base = score_profiles(candidates, job)
+    now = datetime.utcnow()
+    _insert_matches([
+        {'job_id': job.id, 'user_id': candidates[i].user_id, 'score': int(scores[i]), 'updated_at': now}
+        for i in np.flatnonzero(scores > base)
+    ])
+
+
+def score_profiles(profiles, job):
+    """
+    Match score of every profile against one job in one pass
+
+    Uses the same rules and weights as ai_service.calculate_match_score.
+
+    Args:
+        profiles: Profiles or rows with the PROFILE_MATCH_FIELDS attributes
+
+    Returns:
+        tuple: (scores, base_scores) arrays aligned with profiles
+    """
+    base = np.array([profile_base_score(profile) for profile in profiles], dtype=np.int64)
+    sport_match = np.array([profile.sport == job.sport for profile in profiles], dtype=bool)
+    location_match = np.array([bool(profile.city) and profile.city == job.city for profile in profiles], dtype=bool)
+
+    if job.lat is not None and job.lng is not None:
+        origins = [get_profile_origin(profile) for profile in profiles]
+        lat = np.array([origin[0] if origin else np.nan for origin in origins], dtype=np.float64)
+        lng = np.array([origin[1] if origin else np.nan for origin in origins], dtype=np.float64)
+        radius = np.array([origin[2] if origin else 0 for origin in origins], dtype=np.float64)
+        location_match |= _haversine_km(lat, lng, job.lat, job.lng) <= radius
+
+    scores = base + SPORT_MATCH_POINTS * sport_match + LOCATION_MATCH_POINTS * location_match
+    return scores, base
+
+
+def queue_job_matching(job_id):
+    """
+    Recompute a job's stored matches in the background
+
+    Call after the job's changes are committed so the task sees them.
+    """
+    app = current_app._get_current_object()
+    return socketio.start_background_task(_run_job_matching, app, job_id)
+
+
+def rebuild_job_matches(batch_size=200):
+    """Recompute every coach's stored matches (backfill / reconciliation)"""
+    JobMatch.query.delete(synchronize_session=False)
+    db.session.commit()
+    columns = get_job_columns(max_age=0)
+
+    last_id = 0
+    total = 0
+    while True:
+        profiles = Profile.query.join(User, User.id == Profile.user_id).filter(
+            User.role == 'coach',
+            Profile.id > last_id
+        ).order_by(Profile.id).limit(batch_size).all()
+        if not profiles:
+            break
+
+        for profile in profiles:
+            refresh_coach_matches(profile, columns=columns)
+        db.session.commit()
+
+        last_id = profiles[-1].id
+        total += len(profiles)
+
+    return total
+
+
+def get_best_matches(user_id, limit=10):
+    """
+    Best-matching active jobs for a coach from the job_match table
+
+    Returns:
+        list: [(Job, score), ...] best first
+    """
+    return db.session.query(Job, JobMatch.score).join(
+        JobMatch, JobMatch.job_id == Job.id
+    ).filter(
+        JobMatch.user_id == user_id,
+        Job.is_active == True
+    ).order_by(JobMatch.score.desc(), JobMatch.job_id.desc()).limit(limit).all()
+
+
+def get_best_candidates(job_id, limit=10):
+    """
+    Best-matching coaches for a job from the job_match table
+
+    Returns:
+        list: [(Profile, score), ...] best first
+    """
+    return db.session.query(Profile, JobMatch.score).join(
+        JobMatch, JobMatch.user_id == Profile.user_id
+    ).filter(
+        JobMatch.job_id == job_id
+    ).order_by(JobMatch.score.desc(), JobMatch.user_id).limit(limit).all()
+
+
+def _candidate_profiles(job):
+    """Coach profiles that could get job-dependent points for job (indexed prefilters)"""
+    conditions = [Profile.sport == job.sport]
+    if job.city:
+        conditions.append(Profile.city == job.city)
+    if job.lat is not None and job.lng is not None:
+        min_lat, max_lat, min_lng, max_lng = bounding_box(job.lat, job.lng, MAX_RADIUS_KM)
+        conditions.append(and_(
+            Profile.latitude.between(min_lat, max_lat),
+            Profile.longitude.between(min_lng, max_lng)
+        ))
+
+    query = db.session.query(
+        Profile.user_id, *[getattr(Profile, field) for field in PROFILE_MATCH_FIELDS]
+    ).join(User, User.id == Profile.user_id).filter(
+        User.role == 'coach',
+        or_(*conditions)
+    )
+
+    preference = JOB_TYPE_PREFERENCES.get(job.job_type)
+    if preference:
+        query = query.filter(or_(
+            Profile.job_types.is_(None),
+            Profile.job_types == '',
+            Profile.job_types.like(f"%{preference}%")
+        ))
+
+    return query.all()
+
+
+def _accepted_job_types_mask(profile, columns):
+    """Jobs whose type the coach accepts; coaches without preferences accept all"""
+    preferences = {part.strip() for part in (profile.job_types or '').split(',') if part.strip()}
+    if not preferences:
+        return np.ones(len(columns), dtype=bool)
+
+    excluded = [
+        columns.code('job_type', job_type)
+        for job_type, preference in JOB_TYPE_PREFERENCES.items()
+        if preference not in preferences
+    ]
+    return ~np.isin(columns.job_type, excluded)
+
+
+def _run_job_matching(app, job_id):
+    with app.app_context():
+        with _job_matching_lock:
+            try:
+                job = db.session.get(Job, job_id)
+                if job is not None:
+                    refresh_job_matches(job)
+                    db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error matching coaches for job {job_id}: {e}")
+
+
+def _insert_matches(rows):
+    if rows:
+        db.session.execute(JobMatch.__table__.insert(), rows)
+
+
+def _haversine_km(lats, lngs, lat, lng):
+    """Element-wise haversine distance between coordinate arrays and one point"""
+    phi1, phi2 = np.radians(lats), np.radians(lat)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(lng - lngs)
+
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _float(value):
+    return np.nan if value is None else float(value)
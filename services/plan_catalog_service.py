@@ -0,0 +1,171 @@
+"""
+Plan Catalog Service
+Immutable in-process copy of the membership plans, with each plan's features
+pre-resolved into a bitset so feature checks are in-memory bit tests
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.extensions import db
+from models.membership import MembershipPlan
+from services.cache_service import bump_cache_version, get_cache_version
+
+logger = logging.getLogger(__name__)
+
+# Version counter bumped whenever a membership plan is created or edited
+PLAN_CATALOG_VERSION = 'membership_plans'
+
+# How often a process checks whether another process bumped the version
+PLAN_CATALOG_CHECK_SECONDS = 30
+
+
+class CatalogPlan(namedtuple('CatalogPlan', [
+    'id', 'name', 'user_type', 'price', 'currency', 'duration_days', 'features',
+    'monthly_applications', 'monthly_job_posts', 'is_active', 'display_order',
+    'feature_bits', 'feature_index',
+])):
+    """Read-only membership plan; attribute-compatible with MembershipPlan for templates"""
+    __slots__ = ()
+
+    def has_feature(self, feature_name):
+        """Check if plan has specific feature"""
+        bit = self.feature_index.get(feature_name)
+        return bool(bit and self.feature_bits & bit)
+
+
+class PlanCatalog:
+    """Every membership plan, indexed by id and by user type"""
+
+    def __init__(self, plans, version):
+        self.version = version
+
+        # Every feature name that appears in any plan gets its own bit
+        names = sorted({name for plan in plans for name in (plan.features or {})})
+        index = MappingProxyType({name: 1 << position for position, name in enumerate(names)})
+
+        self.by_id = {plan.id: _catalog_plan(plan, index) for plan in plans}
+        self.active_by_type = {}
+        for plan in sorted(self.by_id.values(), key=lambda plan: (plan.display_order or 0, plan.id)):
+            if plan.is_active:
+                self.active_by_type.setdefault(plan.user_type, []).append(plan)
+        self.active_by_type = {
+            user_type: tuple(type_plans) for user_type, type_plans in self.active_by_type.items()
+        }
+
+
+_catalog = None
+_catalog_checked_at = 0.0
+_catalog_lock = threading.Lock()
+
+_events_registered = False
+
+
+def get_plan_catalog():
+    """
+    The current plan catalog
+
+    Rebuilt when this process invalidated it, or when the shared version
+    (checked every PLAN_CATALOG_CHECK_SECONDS) shows another process did.
+    """
+    global _catalog, _catalog_checked_at
+
+    now = time.monotonic()
+    catalog = _catalog
+    if catalog is not None and now - _catalog_checked_at < PLAN_CATALOG_CHECK_SECONDS:
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is not None and now - _catalog_checked_at < PLAN_CATALOG_CHECK_SECONDS:
+            return _catalog
+
+        version = get_cache_version(PLAN_CATALOG_VERSION)
+        if _catalog is None or version is None or version != _catalog.version:
+            _catalog = PlanCatalog(MembershipPlan.query.all(), version)
+        _catalog_checked_at = now
+        return _catalog
+
+
+def get_plan(plan_id):
+    """Catalog plan by id (active or not), or None"""
+    try:
+        plan_id = int(plan_id)
+    except (TypeError, ValueError):
+        return None
+    return get_plan_catalog().by_id.get(plan_id)
+
+
+def get_active_plans(user_type):
+    """Active plans for 'coach' or 'employer', in display order"""
+    return get_plan_catalog().active_by_type.get(user_type, ())
+
+
+def get_free_plan(user_type):
+    """The active 'Free' plan for a user type, or None"""
+    for plan in get_active_plans(user_type):
+        if plan.name == 'Free':
+            return plan
+    return None
+
+
+def invalidate_plan_catalog(session=None):
+    """
+    Mark the catalog stale after creating or editing plans
+
+    Bumps the shared version in the caller's transaction, so other
+    processes reload once the caller commits and their next check runs.
+    This process drops its copy after the commit; dropping it earlier
+    would let a concurrent request reload and keep the old plans.
+    """
+    bump_cache_version(PLAN_CATALOG_VERSION)
+    (session or db.session).info['plan_catalog_stale'] = True
+
+
+def register_plan_catalog_events():
+    """Attach the listeners that apply invalidate_plan_catalog() on commit"""
+    global _events_registered
+    if _events_registered:
+        return
+
+    event.listen(Session, 'after_commit', _drop_stale_catalog)
+    # A copy loaded inside the rolled-back transaction may hold its changes
+    event.listen(Session, 'after_rollback', _drop_stale_catalog)
+
+    _events_registered = True
+
+
+def _drop_stale_catalog(session):
+    global _catalog
+    if session.info.pop('plan_catalog_stale', False):
+        with _catalog_lock:
+            _catalog = None
+
+
+def _catalog_plan(plan, index):
+    features = dict(plan.features or {})
+    bits = 0
+    for name, value in features.items():
+        if value:
+            bits |= index[name]
+
+    return CatalogPlan(
+        id=plan.id,
+        name=plan.name,
+        user_type=plan.user_type,
+        price=plan.price,
+        currency=plan.currency,
+        duration_days=plan.duration_days,
+        features=MappingProxyType(features),
+        monthly_applications=plan.monthly_applications,
+        monthly_job_posts=plan.monthly_job_posts,
+        is_active=plan.is_active,
+        display_order=plan.display_order,
+        feature_bits=bits,
+        feature_index=index,
+    )
@@ -0,0 +1,155 @@
+"""
+Recommendation Service
+Personalized "recommended jobs" for the coach dashboard
+"""
+
+import heapq
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.extensions import db
+from models.job import Job
+from services.geo_service import MAX_RADIUS_KM, get_profile_origin, haversine_km
+from services.match_service import get_best_matches, top_matching_jobs
+
+logger = logging.getLogger(__name__)
+
+# How long a coach's recommendations are reused before being ranked again
+RECOMMENDATION_TTL_SECONDS = 300
+
+# Expired entries are swept once the cache holds this many coaches
+RECOMMENDATION_CACHE_SIZE = 5000
+
+# Best stored matches considered before the distance/recency re-rank
+CANDIDATE_POOL_SIZE = 200
+
+# Extra signals on top of the match score (0-100)
+DISTANCE_POINTS = 10
+RECENCY_POINTS = 10
+RECENCY_HALF_LIFE_DAYS = 7
+
+# user_id -> {k: (expires_at, [(job_id, match_score), ...])}
+_recommendation_cache = {}
+
+_events_registered = False
+
+
+def get_recommended_jobs(profile, k=5):
+    """
+    Top-k recommended active jobs for a coach
+
+    Uses the cached ranking while it is fresh; otherwise re-ranks the
+    coach's best stored matches (see match_service.get_best_matches)
+    by match score plus distance and recency.
+
+    Returns:
+        list: [(Job, match_score), ...] best first
+    """
+    # Keyed by k, so a fresh entry is used however short it is (coaches
+    # with fewer than k matches, or none, are served from the cache too)
+    cached = _recommendation_cache.get(profile.user_id, {}).get(k)
+    if cached and cached[0] > time.monotonic():
+        ranked = cached[1]
+    else:
+        ranked = _rank_recommendations(profile, k)
+        _store(profile.user_id, k, ranked)
+
+    if not ranked:
+        return []
+
+    jobs = {
+        job.id: job
+        for job in Job.query.filter(Job.id.in_([job_id for job_id, _ in ranked]), Job.is_active == True)
+    }
+    return [(jobs[job_id], score) for job_id, score in ranked if job_id in jobs]
+
+
+def invalidate_recommendations(user_id):
+    """Forget a coach's cached recommendations"""
+    _recommendation_cache.pop(user_id, None)
+
+
+def mark_recommendations_stale(user_id, session=None):
+    """
+    Forget a coach's cached recommendations once the caller's transaction commits
+
+    Call when their stored matches change; forgetting them before the
+    commit would let a concurrent dashboard load cache the old matches
+    for the whole TTL.
+    """
+    (session or db.session).info.setdefault('stale_recommendations', set()).add(user_id)
+
+
+def register_recommendation_events():
+    """Attach the listeners that apply mark_recommendations_stale() on commit"""
+    global _events_registered
+    if _events_registered:
+        return
+
+    event.listen(Session, 'after_commit', _drop_stale_recommendations)
+    event.listen(Session, 'after_rollback', _keep_recommendations)
+
+    _events_registered = True
+
+
+def _drop_stale_recommendations(session):
+    for user_id in session.info.pop('stale_recommendations', ()):
+        invalidate_recommendations(user_id)
+
+
+def _keep_recommendations(session):
+    session.info.pop('stale_recommendations', None)
+
+
+def recommendation_score(job, match_score, origin=None, now=None):
+    """
+    Ranking value of a job for the dashboard
+
+    Match score, plus up to DISTANCE_POINTS for being close to the
+    coach and up to RECENCY_POINTS for being newly posted.
+    """
+    score = float(match_score)
+
+    if origin and job.lat is not None and job.lng is not None:
+        distance = haversine_km(origin[0], origin[1], job.lat, job.lng)
+        score += DISTANCE_POINTS * max(0.0, 1 - distance / MAX_RADIUS_KM)
+
+    if job.posted_date:
+        age_days = max(((now or datetime.utcnow()) - job.posted_date).total_seconds() / 86400, 0)
+        score += RECENCY_POINTS * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+    return score
+
+
+def _rank_recommendations(profile, k):
+    """Keep the k best candidates in a heap instead of sorting the whole pool"""
+    candidates = get_best_matches(profile.user_id, CANDIDATE_POOL_SIZE)
+    if not candidates:
+        # No stored matches yet (new coach, or job_match not backfilled)
+        ranked = top_matching_jobs(profile, CANDIDATE_POOL_SIZE)
+        jobs = {
+            job.id: job
+            for job in Job.query.filter(Job.id.in_([job_id for job_id, _ in ranked]), Job.is_active == True)
+        }
+        candidates = [(jobs[job_id], score) for job_id, score in ranked if job_id in jobs]
+
+    origin = get_profile_origin(profile)
+    now = datetime.utcnow()
+    best = heapq.nlargest(
+        k,
+        ((recommendation_score(job, score, origin, now), job.id, score) for job, score in candidates)
+    )
+    return [(job_id, score) for _, job_id, score in best]
+
+
+def _store(user_id, k, ranked):
+    now = time.monotonic()
+    if len(_recommendation_cache) >= RECOMMENDATION_CACHE_SIZE:
+        for key, entries in list(_recommendation_cache.items()):
+            if all(expires_at <= now for expires_at, _ in entries.values()):
+                _recommendation_cache.pop(key, None)
+    _recommendation_cache.setdefault(user_id, {})[k] = (now + RECOMMENDATION_TTL_SECONDS, ranked)
@@ -0,0 +1,255 @@
+"""
+Rollup Service
+Daily counts of jobs posted, applications, hires and signups in daily_rollup,
+so time-windowed stats sum a few rollup rows instead of scanning raw tables
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_, case, event, func, select
+
+from core.extensions import db
+from models.application import Application, ApplicationStatusHistory
+from models.job import Job
+from models.stats import DailyRollup
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# sport/city value of the all-platform rows
+ALL = '*'
+
+JOBS_POSTED = 'jobs_posted'
+APPLICATIONS = 'applications'
+HIRES = 'hires'
+SIGNUP_METRICS = {'coach': 'signups_coach', 'employer': 'signups_employer'}
+
+# Metrics rebuilt from source tables by rebuild_rollups (users have no
+# creation date, so signups are only counted as they happen)
+REBUILDABLE_METRICS = (JOBS_POSTED, APPLICATIONS, HIRES)
+
+_events_registered = False
+
+
+def register_rollup_events():
+    """Attach the insert listeners that add each new event to today's rollups"""
+    global _events_registered
+    if _events_registered:
+        return
+
+    event.listen(Job, 'after_insert', _job_inserted)
+    event.listen(Application, 'after_insert', _application_inserted)
+    event.listen(ApplicationStatusHistory, 'after_insert', _status_logged)
+    event.listen(User, 'after_insert', _user_inserted)
+
+    _events_registered = True
+
+
+def window_start(days, today=None):
+    """First day of a window of `days` days ending today (inclusive)"""
+    return (today or datetime.utcnow().date()) - timedelta(days=days - 1)
+
+
+def window_totals_query(session, windows, sport=None, city=None):
+    """
+    Query summing several metric windows in one pass over daily_rollup
+
+    Args:
+        session: Session to build the query on
+        windows: {label: (metric, first_day)}
+        sport/city: Restrict to one sport and/or city (None = all)
+
+    Returns:
+        Query returning one row with a column per label
+    """
+    earliest = min(first_day for _, first_day in windows.values())
+    metrics = {metric for metric, _ in windows.values()}
+
+    return session.query(*[
+        func.coalesce(func.sum(case(
+            (and_(DailyRollup.metric == metric, DailyRollup.day >= first_day), DailyRollup.value)
+        )), 0).label(label)
+        for label, (metric, first_day) in windows.items()
+    ]).filter(
+        DailyRollup.metric.in_(metrics),
+        DailyRollup.day >= earliest,
+        *_dimension_filters(sport, city)
+    )
+
+
+def get_window_total(metric, days, sport=None, city=None):
+    """Total of one metric over the last `days` days (today included)"""
+    row = window_totals_query(
+        db.session, {'total': (metric, window_start(days))}, sport, city
+    ).one()
+    return int(row.total)
+
+
+def rebuild_rollups(start=None, end=None):
+    """
+    Recount jobs posted, applications and hires per day from the source tables
+
+    Hires are counted once per application, on its first move to Hired.
+
+    Replaces the stored rows for those metrics between start and end
+    (inclusive; defaults to all history) and commits.
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    # Each application counts as a hire once, on the day it first reached Hired
+    first_hire = db.session.query(
+        ApplicationStatusHistory.application_id.label('application_id'),
+        func.min(ApplicationStatusHistory.changed_at).label('hired_at')
+    ).filter(
+        ApplicationStatusHistory.status == 'Hired'
+    ).group_by(ApplicationStatusHistory.application_id).subquery()
+
+    job_day = func.date(func.coalesce(Job.created_at, Job.posted_date))
+    application_day = func.date(func.coalesce(Application.created_at, Application.applied_date))
+    hire_day = func.date(first_hire.c.hired_at)
+
+    # NULL and '' are the same rollup key (see _rollup_row), so group them together
+    sport = func.coalesce(Job.sport, '')
+    city = func.coalesce(Job.city, '')
+
+    sources = {
+        JOBS_POSTED: db.session.query(job_day, sport, city, func.count()),
+        APPLICATIONS: db.session.query(
+            application_day, sport, city, func.count()
+        ).join(Job, Job.id == Application.job_id),
+        HIRES: db.session.query(
+            hire_day, sport, city, func.count()
+        ).select_from(first_hire).join(
+            Application, Application.id == first_hire.c.application_id
+        ).join(Job, Job.id == Application.job_id),
+    }
+    day_columns = {JOBS_POSTED: job_day, APPLICATIONS: application_day, HIRES: hire_day}
+
+    rows = []
+    for metric, query in sources.items():
+        day_column = day_columns[metric]
+        if start:
+            query = query.filter(day_column >= start.isoformat())
+        if end:
+            query = query.filter(day_column <= end.isoformat())
+
+        totals = defaultdict(int)
+        for day, row_sport, row_city, count in query.group_by(day_column, sport, city):
+            day = _as_date(day)
+            totals[day] += count
+            rows.append(_rollup_row(day, metric, row_sport, row_city, count))
+        rows.extend(_rollup_row(day, metric, ALL, ALL, count) for day, count in totals.items())
+
+    stale = DailyRollup.query.filter(DailyRollup.metric.in_(REBUILDABLE_METRICS))
+    if start:
+        stale = stale.filter(DailyRollup.day >= start)
+    if end:
+        stale = stale.filter(DailyRollup.day <= end)
+    stale.delete(synchronize_session=False)
+
+    if rows:
+        db.session.execute(DailyRollup.__table__.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def _dimension_filters(sport, city):
+    if sport is None and city is None:
+        return [DailyRollup.sport == ALL, DailyRollup.city == ALL]
+
+    filters = [DailyRollup.sport != ALL]
+    if sport is not None:
+        filters.append(DailyRollup.sport == sport)
+    if city is not None:
+        filters.append(DailyRollup.city == city)
+    return filters
+
+
+def _as_date(value):
+    # SQLite's date() returns text
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _rollup_row(day, metric, sport, city, value):
+    return {'day': day, 'metric': metric, 'sport': sport or '', 'city': city or '', 'value': value}
+
+
+def _increment(connection, day, metric, sport=ALL, city=ALL):
+    """Add one to a rollup row, in the flush's transaction"""
+    table = DailyRollup.__table__
+    dialect = connection.dialect.name
+    values = _rollup_row(day, metric, sport, city, 1)
+
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(table).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=['day', 'metric', 'sport', 'city'],
+            set_={'value': table.c.value + 1}
+        )
+        connection.execute(statement)
+        return
+
+    updated = connection.execute(
+        table.update().where(and_(
+            table.c.day == values['day'],
+            table.c.metric == metric,
+            table.c.sport == values['sport'],
+            table.c.city == values['city']
+        )).values(value=table.c.value + 1)
+    )
+    if not updated.rowcount:
+        connection.execute(table.insert().values(**values))
+
+
+def _increment_for_job(connection, day, metric, sport, city):
+    _increment(connection, day, metric)
+    _increment(connection, day, metric, sport, city)
+
+
+def _job_inserted(mapper, connection, target):
+    day = (target.created_at or datetime.utcnow()).date()
+    _increment_for_job(connection, day, JOBS_POSTED, target.sport, target.city)
+
+
+def _application_inserted(mapper, connection, target):
+    job = connection.execute(
+        select(Job.sport, Job.city).where(Job.id == target.job_id)
+    ).first()
+    day = (target.created_at or datetime.utcnow()).date()
+    _increment_for_job(connection, day, APPLICATIONS, *(job or (None, None)))
+
+
+def _status_logged(mapper, connection, target):
+    if target.status != 'Hired':
+        return
+    # Only the first transition to Hired counts (re-hires are not new hires)
+    earlier_hire = connection.execute(
+        select(ApplicationStatusHistory.id).where(
+            ApplicationStatusHistory.application_id == target.application_id,
+            ApplicationStatusHistory.status == 'Hired',
+            ApplicationStatusHistory.id != target.id
+        ).limit(1)
+    ).first()
+    if earlier_hire:
+        return
+    job = connection.execute(
+        select(Job.sport, Job.city)
+        .join(Application, Application.job_id == Job.id)
+        .where(Application.id == target.application_id)
+    ).first()
+    day = (target.changed_at or datetime.utcnow()).date()
+    _increment_for_job(connection, day, HIRES, *(job or (None, None)))
+
+
+def _user_inserted(mapper, connection, target):
+    metric = SIGNUP_METRICS.get(target.role)
+    if metric:
+        _increment(connection, datetime.utcnow().date(), metric)
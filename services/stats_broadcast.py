@@ -0,0 +1,100 @@
+"""
+Stats Broadcast Service
+Pushes live stats to subscribed Socket.IO clients (login/register pages)
+instead of every open tab polling /api/stats/*
+"""
+
+import logging
+import threading
+
+from core.extensions import socketio
+from services.stats_service import get_coach_stats, get_employer_stats
+
+logger = logging.getLogger(__name__)
+
+# How often the broadcaster checks the stats snapshots for changes
+STATS_BROADCAST_SECONDS = 10
+
+# channel -> function returning that channel's stats snapshot
+STATS_CHANNELS = {
+    'coach': get_coach_stats,
+    'employer': get_employer_stats,
+}
+
+# channel -> Socket.IO session ids subscribed in this process
+_subscribers = {channel: set() for channel in STATS_CHANNELS}
+# channel -> last stats sent to that channel's room
+_last_sent = {}
+
+_broadcaster_started = False
+_broadcaster_lock = threading.Lock()
+
+
+def stats_room(channel):
+    return f"stats:{channel}"
+
+
+def subscribe(sid, channel, app):
+    """
+    Register a client for a channel and return the current snapshot
+
+    Starts this process's broadcaster on the first subscription.
+
+    Returns:
+        dict: Current stats, or None for an unknown channel
+    """
+    if channel not in STATS_CHANNELS:
+        return None
+
+    stats = STATS_CHANNELS[channel]()
+    _subscribers[channel].add(sid)
+    # New subscribers start from this snapshot, so the first diff is only what changed
+    _last_sent.setdefault(channel, stats)
+    _start_broadcaster(app)
+    return stats
+
+
+def unsubscribe(sid):
+    """Forget a disconnected client"""
+    for sids in _subscribers.values():
+        sids.discard(sid)
+
+
+def stats_diff(old, new):
+    """Keys of new whose values differ from old (all of new if old is None)"""
+    if old is None:
+        return dict(new)
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def _start_broadcaster(app):
+    global _broadcaster_started
+    with _broadcaster_lock:
+        if _broadcaster_started:
+            return
+        _broadcaster_started = True
+    socketio.start_background_task(_broadcast_loop, app)
+
+
+def _broadcast_loop(app):
+    """Emit one diff per channel room whenever its snapshot changes"""
+    while True:
+        socketio.sleep(STATS_BROADCAST_SECONDS)
+        with app.app_context():
+            for channel, get_stats in STATS_CHANNELS.items():
+                if not _subscribers[channel]:
+                    continue
+                try:
+                    stats = get_stats()
+                    # last_updated changes on every refresh; only real changes are sent
+                    changes = stats_diff(_last_sent.get(channel), stats)
+                    changes.pop('last_updated', None)
+                    if changes:
+                        socketio.emit(
+                            "stats_diff",
+                            {'channel': channel, 'changes': changes},
+                            to=stats_room(channel)
+                        )
+                    _last_sent[channel] = stats
+                except Exception as e:
+                    logger.error(f"Error broadcasting {channel} stats: {e}")
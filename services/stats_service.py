@@ -5,63 +5,153 @@ Provides live stats from Neon database for login/register pages and dashboards
 
 from models.user import User
 from models.job import Job
-from models.application import Application
+from models.application import Application, ApplicationStatusHistory
 from models.profile import Profile
 from core.extensions import db
-from datetime import datetime, timedelta
-from sqlalchemy import func, and_
+from services.activity_service import APPLICATION_CREATED, USER_REGISTERED, count_recent_activity, get_recent_jobs
+from services.counter_service import get_counters
+from services.rollup_service import APPLICATIONS, JOBS_POSTED, window_start, window_totals_query
+from datetime import datetime
+from sqlalchemy import func, case, cast, extract, true, Integer
+import hashlib
+import json
 import logging
+import threading
+import time
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# How long a stats snapshot is served before one request refreshes it
+STATS_TTL_SECONDS = 30
+# Fallback (error) results are retried sooner
+STATS_FALLBACK_TTL_SECONDS = 5
+
+# Top-level snapshot keys that only record when it was computed
+SNAPSHOT_TIMESTAMP_KEYS = ('last_updated', 'timestamp')
+
+# name -> (expires_at, stats, version, generated_at), shared by every request in this process
+_stats_snapshots = {}
+_stats_refresh_locks = {
+    'platform': threading.Lock(),
+    'coach': threading.Lock(),
+    'employer': threading.Lock(),
+    'activity': threading.Lock(),
+}
+
+
+def get_stats_snapshot(name, compute):
+    """
+    Get a shared stats snapshot, refreshing it at most once per TTL
+
+    Only one caller recomputes an expired snapshot; concurrent callers
+    get the previous snapshot meanwhile, or, before the first snapshot
+    exists, wait for the refresher and share its result.
+
+    Args:
+        name: Snapshot name (key of _stats_refresh_locks)
+        compute: Callable that queries the database for fresh stats
+    """
+    return _get_snapshot_entry(name, compute)[1]
+
+
+def get_versioned_stats(name):
+    """
+    Get a named snapshot with its version
+
+    Returns:
+        tuple: (stats, version, generated_at); version is a digest of the
+        snapshot's values (see stats_version), usable as a (weak) ETag
+    """
+    _, stats, version, generated_at = _get_snapshot_entry(name, STATS_SNAPSHOTS[name])
+    return stats, version, generated_at
+
+
+def _get_snapshot_entry(name, compute):
+    entry = _stats_snapshots.get(name)
+    if entry and entry[0] > time.monotonic():
+        return entry
+
+    lock = _stats_refresh_locks[name]
+    if not lock.acquire(blocking=entry is None):
+        # Someone else is refreshing; serve the stale snapshot
+        return entry
+
+    try:
+        entry = _stats_snapshots.get(name)
+        if entry and entry[0] > time.monotonic():
+            return entry
+
+        stats = compute()
+        generated_at = datetime.utcnow().isoformat()
+        # Digest once per refresh, so conditional requests never re-serialize
+        version = stats_version(stats)
+        ttl = STATS_FALLBACK_TTL_SECONDS if stats.get('fallback') else STATS_TTL_SECONDS
+        entry = (time.monotonic() + ttl, stats, version, generated_at)
+        _stats_snapshots[name] = entry
+        return entry
+    finally:
+        lock.release()
+
+
+def stats_version(stats):
+    """
+    Digest of a snapshot's values, leaving out its generation timestamps
+
+    Unchanged data keeps the same version across refreshes and workers,
+    so pollers get 304s until a number actually changes.
+    """
+    values = {key: value for key, value in stats.items() if key not in SNAPSHOT_TIMESTAMP_KEYS}
+    return hashlib.sha1(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()[:20]
+
 
 def get_platform_stats():
+    """Get platform statistics (shared snapshot, see get_stats_snapshot)"""
+    return get_stats_snapshot('platform', _compute_platform_stats)
+
+
+def _compute_platform_stats():
     """Get real-time platform statistics from Neon database"""
     try:
         # Get current timestamp for time-based queries
         now = datetime.utcnow()
-        thirty_days_ago = now - timedelta(days=30)
-        seven_days_ago = now - timedelta(days=7)
         
         # Execute all queries in a single database session for efficiency
         with db.session() as session:
-            # Basic counts
-            total_coaches = session.query(User).filter_by(role='coach').count()
-            total_employers = session.query(User).filter_by(role='employer').count()
-            total_jobs = session.query(Job).count()
-            active_jobs = session.query(Job).filter_by(is_active=True).count()
-            total_applications = session.query(Application).count()
-            
-            # Verified coaches (completed onboarding)
-            verified_coaches = session.query(User).filter(
-                and_(
-                    User.role == 'coach',
-                    User.onboarding_completed == True
-                )
-            ).count()
-            
-            # Recent activity (last 30 days)
-            recent_jobs = session.query(Job).filter(
-                Job.created_at >= thirty_days_ago
-            ).count()
+            # Running totals are maintained by ORM events (counter_service)
+            counters = get_counters()
+            total_coaches = counters['total_coaches']
+            verified_coaches = counters['verified_coaches']
+            total_employers = counters['total_employers']
+            total_jobs = counters['total_jobs']
+            active_jobs = counters['active_jobs']
+            total_applications = counters['total_applications']
+            hired_applications = counters['hired_applications']
+            interview_applications = counters['interview_applications']
             
-            recent_applications = session.query(Application).filter(
-                Application.created_at >= thirty_days_ago
-            ).count()
+            # Time-windowed counts in one round trip: sums over the daily
+            # rollups (rollup_service) instead of range scans of job/application
+            today = now.date()
+            window_counts = window_totals_query(session, {
+                'recent_jobs': (JOBS_POSTED, window_start(30, today)),
+                'weekly_jobs': (JOBS_POSTED, window_start(7, today)),
+                'recent_applications': (APPLICATIONS, window_start(30, today)),
+                'weekly_applications': (APPLICATIONS, window_start(7, today)),
+            }).subquery()
             
-            # This week's activity
-            weekly_jobs = session.query(Job).filter(
-                Job.created_at >= seven_days_ago
-            ).count()
+            # Average days from applying to first reaching Hired / Interview,
+            # from the status history
+            hire_times = _time_to_status(session, 'Hired').subquery()
+            interview_times = _time_to_status(session, 'Interview').subquery()
             
-            weekly_applications = session.query(Application).filter(
-                Application.created_at >= seven_days_ago
-            ).count()
-            
-            # Success metrics
-            hired_applications = session.query(Application).filter_by(status='Hired').count()
-            interview_applications = session.query(Application).filter_by(status='Interview').count()
+            # Each subquery is a single row, so joining them on true is cheap
+            counts = session.query(
+                window_counts, hire_times.c.avg_days, interview_times.c.avg_days
+            ).select_from(window_counts).join(
+                hire_times, true()
+            ).join(interview_times, true()).one()
+            (recent_jobs, weekly_jobs, recent_applications, weekly_applications,
+             hire_days, interview_days) = counts
             
             # Calculate success rate (hired + interview / total applications)
             if total_applications > 0:
@@ -69,16 +159,9 @@ def get_platform_stats():
             else:
                 success_rate = 0
             
-            # Calculate average time to hire (simplified - based on application age)
-            avg_hire_time = 7  # Default
-            try:
-                hired_apps = session.query(Application).filter_by(status='Hired').all()
-                if hired_apps:
-                    total_days = sum([(app.created_at - app.applied_date).days for app in hired_apps if app.applied_date])
-                    if total_days > 0:
-                        avg_hire_time = max(1, round(total_days / len(hired_apps)))
-            except Exception as e:
-                logger.warning(f"Error calculating average hire time: {e}")
+            # Average time to hire / interview (default until transitions are logged)
+            avg_hire_time = max(1, round(hire_days)) if hire_days is not None else 7
+            avg_interview_time = max(1, round(interview_days)) if interview_days is not None else 3
             
             # Get top sports (most popular)
             top_sports = session.query(
@@ -99,6 +182,7 @@ def get_platform_stats():
                 'weekly_applications': weekly_applications,
                 'success_rate': success_rate,
                 'avg_hire_time': avg_hire_time,
+                'avg_interview_time': avg_interview_time,
                 'hired_count': hired_applications,
                 'interview_count': interview_applications,
                 'top_sports': [sport[0] for sport in top_sports] if top_sports else ['Cricket', 'Football', 'Basketball'],
@@ -121,6 +205,7 @@ def get_platform_stats():
             'weekly_applications': 18,
             'success_rate': 78,
             'avg_hire_time': 7,
+            'avg_interview_time': 3,
             'hired_count': 95,
             'interview_count': 155,
             'top_sports': ['Cricket', 'Football', 'Basketball'],
@@ -129,7 +214,39 @@ def get_platform_stats():
         }
 
 
+def _time_to_status(session, status):
+    """
+    Query for the average whole days from applying to first reaching a status
+
+    One row with avg_days (None when no application has reached it).
+    """
+    reached = session.query(
+        ApplicationStatusHistory.application_id,
+        func.min(ApplicationStatusHistory.changed_at).label('reached_at')
+    ).filter(
+        ApplicationStatusHistory.status == status
+    ).group_by(ApplicationStatusHistory.application_id).subquery()
+
+    return session.query(
+        func.avg(_whole_days(Application.applied_date, reached.c.reached_at)).label('avg_days')
+    ).select_from(reached).join(
+        Application, Application.id == reached.c.application_id
+    ).filter(Application.applied_date.isnot(None))
+
+
+def _whole_days(start, end):
+    """Whole days between two timestamp columns, as SQL"""
+    if db.engine.dialect.name == 'postgresql':
+        return func.floor(extract('epoch', end - start) / 86400)
+    return cast(func.julianday(end) - func.julianday(start), Integer)
+
+
 def get_coach_stats():
+    """Get coach statistics (shared snapshot, see get_stats_snapshot)"""
+    return get_stats_snapshot('coach', _compute_coach_stats)
+
+
+def _compute_coach_stats():
     """Get coach-specific statistics from Neon database"""
     try:
         stats = get_platform_stats()
@@ -143,7 +260,7 @@ def get_coach_stats():
                 avg_applications_per_job = 0
             
             # Get completion rate for onboarding
-            total_coach_users = session.query(User).filter_by(role='coach').count()
+            total_coach_users = get_counters()['total_coaches']
             if total_coach_users > 0:
                 onboarding_completion_rate = round((stats['verified_coaches'] / total_coach_users * 100), 1)
             else:
@@ -178,6 +295,11 @@ def get_coach_stats():
 
 
 def get_employer_stats():
+    """Get employer statistics (shared snapshot, see get_stats_snapshot)"""
+    return get_stats_snapshot('employer', _compute_employer_stats)
+
+
+def _compute_employer_stats():
     """Get employer-specific statistics from Neon database"""
     try:
         stats = get_platform_stats()
@@ -188,12 +310,7 @@ def get_employer_stats():
             avg_time_to_first_app = 2  # days (simplified)
             
             # Get employer satisfaction metrics
-            active_employers = session.query(User).filter(
-                and_(
-                    User.role == 'employer',
-                    User.employer_onboarding_completed == True
-                )
-            ).count()
+            active_employers = get_counters()['active_employers']
             
             # Calculate job fill rate (jobs with hired status)
             jobs_with_hires = session.query(Job).join(Application).filter(
@@ -238,38 +355,30 @@ def get_employer_stats():
 
 
 def get_live_activity():
-    """Get recent live activity for real-time updates"""
+    """Get recent live activity (shared snapshot, see get_stats_snapshot)"""
+    return get_stats_snapshot('activity', _compute_live_activity)
+
+
+def _compute_live_activity():
+    """Get recent live activity for real-time updates, from the in-memory feed (no queries)"""
     try:
-        with db.session() as session:
-            # Get recent activities (last 24 hours)
-            yesterday = datetime.utcnow() - timedelta(days=1)
-            
-            recent_jobs = session.query(Job).filter(
-                Job.created_at >= yesterday
-            ).order_by(Job.created_at.desc()).limit(5).all()
-            
-            recent_applications = session.query(Application).filter(
-                Application.created_at >= yesterday
-            ).order_by(Application.created_at.desc()).limit(5).all()
-            
-            recent_users = session.query(User).filter(
-                User.id.isnot(None)  # Simple filter to get recent users
-            ).order_by(User.id.desc()).limit(3).all()
-            
-            return {
-                'recent_jobs': [
-                    {
-                        'title': job.title,
-                        'sport': job.sport,
-                        'location': job.city or job.location,
-                        'created_at': job.created_at.strftime('%H:%M')
-                    } for job in recent_jobs
-                ],
-                'recent_applications': len(recent_applications),
-                'recent_signups': len(recent_users),
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            
+        recent_jobs = get_recent_jobs()[:5]
+        
+        return {
+            'recent_jobs': [
+                {
+                    'title': item['title'],
+                    'sport': item['sport'],
+                    'location': item['location'],
+                    'created_at': item['at'].strftime('%H:%M')
+                } for item in recent_jobs
+            ],
+            # Rolling last 24 hours
+            'recent_applications': count_recent_activity(APPLICATION_CREATED),
+            'recent_signups': count_recent_activity(USER_REGISTERED),
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        
     except Exception as e:
         logger.error(f"Error fetching live activity: {e}")
         return {
@@ -278,4 +387,13 @@ def get_live_activity():
             'recent_signups': 0,
             'timestamp': datetime.utcnow().isoformat(),
             'fallback': True
-        }
\ No newline at end of file
+        }
+
+
+# Snapshot name -> compute function, for get_versioned_stats
+STATS_SNAPSHOTS = {
+    'platform': _compute_platform_stats,
+    'coach': _compute_coach_stats,
+    'employer': _compute_employer_stats,
+    'activity': _compute_live_activity,
+}
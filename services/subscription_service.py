@@ -0,0 +1,297 @@
+"""
+Subscription Service
+Free-plan provisioning and the periodic expiry/renewal sweep, so membership
+guards only ever read the subscription's status
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import exists
+
+from core.extensions import db
+from models.membership import MembershipPlan, SubscriptionHistory, UserSubscription
+from models.user import User
+from services.plan_catalog_service import get_free_plan, get_plan_catalog, invalidate_plan_catalog
+
+logger = logging.getLogger(__name__)
+
+# Free subscriptions never run out
+FREE_SUBSCRIPTION_DAYS = 999999
+
+# Roles that get a free subscription
+SUBSCRIBER_ROLES = ('coach', 'employer')
+
+# Paid auto-renewing subscriptions get a pending renewal this many days
+# before they end, spreading renewals over the days before expiry
+RENEWAL_LEAD_DAYS = 3
+
+SWEEP_BATCH_SIZE = 500
+
+
+def free_subscription_values(user_id, plan_id, today=None):
+    """Column values of a free subscription starting today"""
+    today = today or datetime.utcnow().date()
+    now = datetime.utcnow()
+    return {
+        'user_id': user_id,
+        'plan_id': plan_id,
+        'status': 'active',
+        'start_date': today,
+        'end_date': today + timedelta(days=FREE_SUBSCRIPTION_DAYS),
+        'auto_renew': False,
+        'payment_method': 'free',
+        'created_at': now,
+        'updated_at': now,
+    }
+
+
+def add_free_subscription(user):
+    """
+    Give a newly registered user the free plan of their role
+
+    Adds the subscription to the caller's transaction (the user must
+    already have an id, e.g. after a flush); the caller commits. Only reads
+    the plans: a missing free plan is left to seed_free_plans.
+
+    Returns:
+        UserSubscription, or None if there is no free plan for the role
+    """
+    plan = get_free_plan(user.role)
+    if not plan:
+        logger.warning(f"No free plan for role {user.role}; user {user.id} left without a subscription")
+        return None
+
+    subscription = UserSubscription(**free_subscription_values(user.id, plan.id))
+    db.session.add(subscription)
+    return subscription
+
+
+def seed_free_plans():
+    """
+    Create the free plan of each subscriber role if it is missing
+
+    Same rows as migrations/seed_free_membership_plans.sql, for databases
+    set up without it.
+
+    Returns:
+        int: Number of plans created
+    """
+    default_plans = MembershipPlan.get_default_plans()
+    created = 0
+
+    for role in SUBSCRIBER_ROLES:
+        plan_data = default_plans.get(role, {}).get('free')
+        if not plan_data or get_free_plan(role):
+            continue
+
+        db.session.add(MembershipPlan(
+            name=plan_data['name'],
+            user_type=role,
+            price=plan_data['price'],
+            duration_days=plan_data['duration_days'],
+            features=plan_data['features'],
+            monthly_applications=plan_data.get('monthly_applications'),
+            monthly_job_posts=plan_data.get('monthly_job_posts'),
+            is_active=True,
+            display_order=0
+        ))
+        created += 1
+
+    if created:
+        invalidate_plan_catalog()
+        db.session.commit()
+
+    return created
+
+
+def provision_free_subscriptions(batch_size=1000):
+    """
+    Bulk-create free subscriptions for every coach/employer without one
+
+    Seeds missing free plans first, then inserts one batch of users per
+    statement and commits per batch.
+
+    Returns:
+        int: Number of subscriptions created
+    """
+    created = 0
+    today = datetime.utcnow().date()
+    seed_free_plans()
+
+    for role in SUBSCRIBER_ROLES:
+        plan = get_free_plan(role)
+        if not plan:
+            logger.warning(f"No free plan for role {role}; skipping")
+            continue
+
+        last_id = 0
+        while True:
+            user_ids = [
+                user_id for user_id, in db.session.query(User.id).filter(
+                    User.role == role,
+                    User.id > last_id,
+                    ~exists().where(UserSubscription.user_id == User.id)
+                ).order_by(User.id).limit(batch_size)
+            ]
+            if not user_ids:
+                break
+
+            db.session.execute(
+                UserSubscription.__table__.insert(),
+                [free_subscription_values(user_id, plan.id, today) for user_id in user_ids]
+            )
+            db.session.commit()
+
+            created += len(user_ids)
+            last_id = user_ids[-1]
+
+    return created
+
+
+def sweep_subscriptions(today=None, batch_size=SWEEP_BATCH_SIZE):
+    """
+    Renew, queue renewals for and expire subscriptions in batches
+
+    Run periodically (see run_subscription_maintenance.py):
+
+    1. Auto-renewing subscriptions to free plans that have ended are
+       extended by the plan's duration.
+    2. Auto-renewing subscriptions to paid plans ending within
+       RENEWAL_LEAD_DAYS get a pending 'renew' history row (once per
+       period), for payment processing to pick up.
+    3. Active subscriptions that have ended are marked 'expired'.
+
+    Every change writes SubscriptionHistory rows with one bulk insert per
+    batch, and each batch is committed.
+
+    Returns:
+        dict: {'renewed': int, 'queued': int, 'expired': int}
+    """
+    today = today or datetime.utcnow().date()
+    plans = get_plan_catalog().by_id
+    free_plan_ids = [plan.id for plan in plans.values() if not plan.price]
+    paid_plan_ids = [plan.id for plan in plans.values() if plan.price]
+
+    return {
+        'renewed': _renew_free_subscriptions(free_plan_ids, plans, today, batch_size),
+        'queued': _queue_renewals(paid_plan_ids, plans, today, batch_size),
+        'expired': _expire_subscriptions(today, batch_size),
+    }
+
+
+def _renew_free_subscriptions(plan_ids, plans, today, batch_size):
+    renewed = 0
+    for plan_id in plan_ids:
+        plan = plans[plan_id]
+        while True:
+            batch = _batch(
+                UserSubscription.status == 'active',
+                UserSubscription.auto_renew == True,
+                UserSubscription.plan_id == plan_id,
+                UserSubscription.end_date < today,
+                batch_size=batch_size
+            )
+            if not batch:
+                break
+
+            UserSubscription.query.filter(
+                UserSubscription.id.in_([subscription_id for subscription_id, _ in batch])
+            ).update({
+                UserSubscription.start_date: today,
+                UserSubscription.end_date: today + timedelta(days=plan.duration_days),
+                UserSubscription.updated_at: datetime.utcnow(),
+            }, synchronize_session=False)
+            _add_history(batch, plan_id, 'renew', 0, 'completed')
+            db.session.commit()
+            renewed += len(batch)
+    return renewed
+
+
+def _queue_renewals(plan_ids, plans, today, batch_size):
+    queued = 0
+    for plan_id in plan_ids:
+        plan = plans[plan_id]
+        last_id = 0
+        while True:
+            batch = _batch(
+                UserSubscription.status == 'active',
+                UserSubscription.auto_renew == True,
+                UserSubscription.plan_id == plan_id,
+                UserSubscription.end_date <= today + timedelta(days=RENEWAL_LEAD_DAYS),
+                UserSubscription.id > last_id,
+                # Not already queued for this period
+                ~exists().where(
+                    SubscriptionHistory.user_id == UserSubscription.user_id,
+                    SubscriptionHistory.action == 'renew',
+                    SubscriptionHistory.status == 'pending',
+                    SubscriptionHistory.created_at >= UserSubscription.start_date
+                ),
+                batch_size=batch_size
+            )
+            if not batch:
+                break
+
+            _add_history(batch, plan_id, 'renew', plan.price, 'pending')
+            db.session.commit()
+            queued += len(batch)
+            last_id = batch[-1][0]
+    return queued
+
+
+def _expire_subscriptions(today, batch_size):
+    expired = 0
+    while True:
+        batch = db.session.query(
+            UserSubscription.id, UserSubscription.user_id, UserSubscription.plan_id
+        ).filter(
+            UserSubscription.status == 'active',
+            UserSubscription.end_date < today
+        ).order_by(UserSubscription.id).limit(batch_size).all()
+        if not batch:
+            break
+
+        UserSubscription.query.filter(
+            UserSubscription.id.in_([subscription_id for subscription_id, _, _ in batch])
+        ).update({
+            UserSubscription.status: 'expired',
+            UserSubscription.updated_at: datetime.utcnow(),
+        }, synchronize_session=False)
+
+        now = datetime.utcnow()
+        db.session.execute(SubscriptionHistory.__table__.insert(), [
+            _history_values(user_id, plan_id, 'expire', 0, 'completed', now)
+            for _, user_id, plan_id in batch
+        ])
+        db.session.commit()
+        expired += len(batch)
+    return expired
+
+
+def _batch(*conditions, batch_size):
+    """Next (subscription id, user id) pairs matching the conditions, by id"""
+    return db.session.query(UserSubscription.id, UserSubscription.user_id).filter(
+        *conditions
+    ).order_by(UserSubscription.id).limit(batch_size).all()
+
+
+def _add_history(batch, plan_id, action, amount, status):
+    now = datetime.utcnow()
+    db.session.execute(SubscriptionHistory.__table__.insert(), [
+        _history_values(user_id, plan_id, action, amount, status, now)
+        for _, user_id in batch
+    ])
+
+
+def _history_values(user_id, plan_id, action, amount, status, now):
+    return {
+        'user_id': user_id,
+        'plan_id': plan_id,
+        'action': action,
+        'amount': amount,
+        'currency': 'INR',
+        'status': status,
+        'notes': 'Subscription sweep',
+        'created_at': now,
+    }
+
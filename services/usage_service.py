@@ -0,0 +1,88 @@
+"""
+Usage Service
+Monthly usage counters for limited membership features, with an atomic
+check-and-increment so limits hold under concurrent submits
+"""
+
+from datetime import datetime
+
+from core.extensions import db
+from models.membership import UsageCounter
+
+# Limits at or above this are treated as unlimited
+UNLIMITED = 999999
+
+
+def current_period(now=None):
+    """Usage period ('YYYY-MM') a moment falls in"""
+    return (now or datetime.utcnow()).strftime('%Y-%m')
+
+
+def get_usage(user_id, feature, period=None):
+    """Uses of a feature by a user in a period (default: this month)"""
+    count = db.session.query(UsageCounter.count).filter_by(
+        user_id=user_id,
+        feature=feature,
+        period=period or current_period()
+    ).scalar()
+    return count or 0
+
+
+def consume_usage(user_id, feature, limit=None):
+    """
+    Record one use of a feature if the user is still under the limit
+
+    Runs a single conditional UPDATE inside the caller's transaction; the
+    row stays locked until the caller commits, so concurrent submits by
+    the same user are counted one at a time. Roll back to undo.
+
+    Args:
+        user_id: User ID
+        feature: 'job_applications' or 'job_posting'
+        limit: Monthly limit (None or UNLIMITED for no limit)
+
+    Returns:
+        bool: True if the use was recorded, False if the limit is reached
+    """
+    period = current_period()
+    _ensure_counter(user_id, feature, period)
+
+    table = UsageCounter.__table__
+    statement = table.update().where(
+        table.c.user_id == user_id,
+        table.c.feature == feature,
+        table.c.period == period
+    )
+    if limit is not None and limit < UNLIMITED:
+        statement = statement.where(table.c.count < limit)
+
+    result = db.session.execute(
+        statement.values(count=table.c.count + 1, updated_at=datetime.utcnow())
+    )
+    return result.rowcount == 1
+
+
+def _ensure_counter(user_id, feature, period):
+    """Create the period's counter row at zero unless it exists"""
+    values = {'user_id': user_id, 'feature': feature, 'period': period, 'count': 0}
+    dialect = db.engine.dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        db.session.execute(
+            insert(UsageCounter).values(**values).on_conflict_do_nothing(
+                index_elements=['user_id', 'feature', 'period']
+            )
+        )
+        return
+
+    exists = db.session.query(UsageCounter.id).filter_by(
+        user_id=user_id, feature=feature, period=period
+    ).first()
+    if not exists:
+        db.session.add(UsageCounter(**values))
+        db.session.flush()
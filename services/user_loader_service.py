@@ -0,0 +1,52 @@
+"""
+User Loader Service
+Loads the logged-in user together with their profile and subscription in a
+single joined query, so guards, views and templates read them without lazy loads
+"""
+
+from sqlalchemy.orm import joinedload
+
+from models.user import User
+
+
+def session_user_options():
+    """Eager-load options for the relationships read on most authenticated pages"""
+    # Imported here so the UserSubscription backref is configured on User
+    from models.membership import UserSubscription  # noqa: F401
+
+    return (
+        joinedload(User.profile),
+        joinedload(User.subscription),
+    )
+
+
+def load_session_user(user_id):
+    """
+    Load a user with profile and subscription for Flask-Login
+
+    Args:
+        user_id: User id from the session
+
+    Returns:
+        User, or None if the id is invalid or the user no longer exists
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    # one_or_none() rather than first(): no LIMIT, so no subquery around the joins
+    return User.query.options(*session_user_options()).filter(User.id == user_id).one_or_none()
+
+
+def get_loaded_subscription(user):
+    """
+    The user's subscription, using the eager-loaded relationship
+
+    Falls back to a lazy load for users not loaded by load_session_user.
+
+    Returns:
+        UserSubscription, or None
+    """
+    subscriptions = user.subscription
+    return subscriptions[0] if subscriptions else None
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Show Access Policies
+Print the compiled endpoint access-policy table (core/access_guard)
+"""
+
+from core.app_factory import create_app
+from core.access_guard import dump_access_policies
+
+
+def show_access_policies():
+    """Print one line per endpoint with its compiled policy"""
+
+    app = create_app()
+
+    policies = dump_access_policies(app)
+    print(f"{'ENDPOINT':<50} {'PUBLIC':<7} {'ONBOARDING':<18} {'NOTICE':<7} MEMBERSHIP")
+    print("-" * 100)
+    for policy in policies:
+        membership = policy['membership_feature'] or '-'
+        if policy['membership_user_type']:
+            membership += f" ({policy['membership_user_type']})"
+        print(
+            f"{str(policy['endpoint']):<50} {'yes' if policy['public'] else 'no':<7} "
+            f"{','.join(policy['onboarding_roles']) or '-':<18} "
+            f"{'yes' if policy['onboarding_notice'] else 'no':<7} {membership}"
+        )
+    print(f"\n✅ {len(policies)} endpoints")
+
+
+if __name__ == "__main__":
+    print("🛡️ Access Policies")
+    print("=" * 60)
+    show_access_policies()
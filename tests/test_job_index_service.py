@@ -0,0 +1,67 @@
+"""
+Job Index Service tests
+Salary parsing behind the min_salary / max_salary job filters
+"""
+
+import pytest
+
+from services.job_index_service import parse_salary_range
+
+
+@pytest.mark.parametrize("salary_range, expected", [
+    ("25000 - 40000", (25000, 40000)),
+    ("₹25,000 to 40,000", (25000, 40000)),
+    ("25k-40k", (25000, 40000)),
+    ("30000", (30000, 30000)),
+    ("2.5 lakh", (250000, 250000)),
+    ("Negotiable", (None, None)),
+    ("", (None, None)),
+    (None, (None, None)),
+])
+def test_parse_salary_range(salary_range, expected):
+    assert parse_salary_range(salary_range) == expected
+
+
+@pytest.mark.parametrize("salary_range, expected", [
+    ("25-40k", (25000, 40000)),
+    ("10 - 15 lakh", (1000000, 1500000)),
+    # A leading number already on the larger scale keeps its own value
+    ("25000 - 40k", (25000, 40000)),
+])
+def test_trailing_unit_applies_to_bare_leading_number(salary_range, expected):
+    assert parse_salary_range(salary_range) == expected
+
+
+@pytest.mark.parametrize("salary_range, expected", [
+    ("15 LPA", (125000, 125000)),
+    ("10-15 LPA", (83333, 125000)),
+    ("12 lakh per annum", (100000, 100000)),
+    ("3,00,000 p.a.", (25000, 25000)),
+    ("360000/year", (30000, 30000)),
+    ("2.4 lakh annually", (20000, 20000)),
+])
+def test_annual_salaries_are_stored_per_month(salary_range, expected):
+    assert parse_salary_range(salary_range) == expected
+
+
+@pytest.mark.parametrize("annual, monthly", [
+    ("3.6 LPA", "30000/month"),
+    ("6 lakh per annum", "50k per month"),
+    ("300000 per year", "25,000"),
+])
+def test_annual_and_monthly_salaries_compare_on_one_period(annual, monthly):
+    assert parse_salary_range(annual) == parse_salary_range(monthly)
+
+
+def test_monthly_job_outranks_lower_annual_salary():
+    # 4 LPA is about 33k a month, below a 40k monthly salary
+    assert parse_salary_range("4 LPA")[1] < parse_salary_range("40000 per month")[1]
+
+
+@pytest.mark.parametrize("salary_range, expected", [
+    ("3-5 years, 20000/month", (20000, 20000)),
+    ("2+ years exp, 18k per month", (18000, 18000)),
+    ("5 yrs experience", (None, None)),
+])
+def test_numbers_tied_to_non_salary_words_are_skipped(salary_range, expected):
+    assert parse_salary_range(salary_range) == expected